@@ -7,9 +7,79 @@ This script handles dependency installation and launches the main program
 import os
 import sys
 import subprocess
+import shutil
+import tempfile
+import hashlib
+import re
+import importlib
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
 import tkinter as tk
 from tkinter import ttk, messagebox
 import threading
+import queue
+
+# Pinned dependency ranges, shipped next to this script
+REQUIREMENTS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "requirements.txt")
+
+# Optional local wheelhouse (pip wheel -r requirements.txt -w wheels); when
+# present it's tried first so installs work offline and at disk speed
+WHEELHOUSE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "wheels")
+
+# Where find_brew() looks: PATH, then the Apple Silicon and Intel Homebrew prefixes
+BREW_SEARCH_PATH = os.pathsep.join([os.environ.get("PATH", ""), "/opt/homebrew/bin", "/usr/local/bin"])
+
+# Import name for each pip package, used to check what's already installed
+PKG_TO_MODULE = {
+    "opencv-python": "cv2",
+    "numpy": "numpy",
+    "pyaudio": "pyaudio",
+    "SpeechRecognition": "speech_recognition",
+    "ttkbootstrap": "ttkbootstrap"
+}
+
+# Name shown in the log for each pip package
+PKG_DISPLAY_NAMES = {
+    "opencv-python": "OpenCV",
+    "numpy": "NumPy",
+    "pyaudio": "PyAudio",
+    "SpeechRecognition": "SpeechRecognition",
+    "ttkbootstrap": "ttkbootstrap"
+}
+
+# Persistent pip cache so re-running the installer reuses downloaded/built wheels
+PIP_CACHE_DIR = os.path.expanduser("~/Library/Caches/imac-security/pip")
+
+# Concurrent 'pip download' processes
+DOWNLOAD_WORKERS = 6
+
+# Written after a successful install; holds install_key() for that install
+INSTALL_STAMP = os.path.expanduser("~/Library/Caches/imac-security/.installed-v1")
+
+# Packages that always ship macOS wheels; the batch install refuses to build
+# these from source so a missing wheel fails fast instead of compiling for minutes
+BINARY_ONLY_PACKAGES = ["opencv-python", "numpy"]
+
+# pip output lines that mark progress through an install
+PIP_PROGRESS_RE = re.compile(r"^\s*(Collecting|Downloading|Building wheel for|Installing collected packages:)\s*(\S*)")
+
+# Lines kept in the installer's log view
+LOG_MAX_LINES = 2000
+
+# pip run by this interpreter. -E keeps PYTHONPATH and friends from leaking
+# other packages into pip; -s is left off since the system Python installs
+# into the user site-packages
+PIP_COMMAND = [sys.executable, "-E", "-m", "pip"]
+
+# No self-update check or interactive prompts from pip
+PIP_ENV = dict(os.environ, PIP_DISABLE_PIP_VERSION_CHECK="1", PIP_NO_INPUT="1")
+
+# Only needed for voice detection; left out of the first install and added
+# by the main app (running this script with --voice) when it's switched on
+VOICE_DEPENDENCIES = ["pyaudio", "SpeechRecognition"]
+
+# Oldest pip trusted with the install flags used here; newer ones aren't upgraded
+MIN_PIP_VERSION = (23, 0)
 
 def main():
     """Main installation and launcher function"""
@@ -29,28 +99,48 @@ def main():
             tk.messagebox.showerror("Python Version Error", "Python 3.7 or higher is required.")
         sys.exit(1)
     
-    # Dependencies to install
-    dependencies = [
+    # --voice: just add the voice detection dependencies, then exit
+    voice_only = "--voice" in sys.argv[1:]
+    
+    # Dependencies to install - from requirements.txt, or the built-in list
+    # if the installer was copied somewhere on its own
+    requirements = read_requirements(REQUIREMENTS_FILE) or [
         "opencv-python",
         "numpy",
         "pyaudio",
         "SpeechRecognition",
-        "Pillow",
         "ttkbootstrap"
     ]
+    if voice_only:
+        dependencies = [dep for dep in requirements if dep in VOICE_DEPENDENCIES] or VOICE_DEPENDENCIES
+    else:
+        dependencies = [dep for dep in requirements if dep not in VOICE_DEPENDENCIES]
+    
+    # A previous run already installed everything for this Python - skip the
+    # installer and go straight to the app
+    main_script = find_main_script()
+    if not voice_only and main_script and read_install_stamp() == install_key(dependencies):
+        print("Dependencies already installed, launching...")
+        try:
+            exec_main_script(main_script)
+        except OSError as e:
+            # Couldn't start it - forget the stamp and run the installer as usual
+            print(f"Error launching application: {e}")
+            clear_install_stamp()
     
     # Create installer GUI
     root = tk.Tk()
+    # Stay hidden until the widgets are laid out, so the window never
+    # flashes up at the default size and position first
+    root.withdraw()
     root.title("iMac Security System - Installer")
-    root.geometry("500x400")
     
-    # Center the window
+    # Center the window, with size and position set in one go
     window_width = 500
     window_height = 400
-    screen_width = root.winfo_screenwidth()
-    screen_height = root.winfo_screenheight()
-    center_x = int(screen_width/2 - window_width/2)
-    center_y = int(screen_height/2 - window_height/2)
+    screen_width, screen_height = root.winfo_screenwidth(), root.winfo_screenheight()
+    center_x = (screen_width - window_width) // 2
+    center_y = (screen_height - window_height) // 2
     root.geometry(f'{window_width}x{window_height}+{center_x}+{center_y}')
     
     # Prevent closing during installation
@@ -68,7 +158,8 @@ def main():
     header_label = tk.Label(root, text="iMac Security System", font=("Helvetica", 18, "bold"))
     header_label.pack(pady=(20, 5))
     
-    subtitle_label = tk.Label(root, text="Dependency Installer", font=("Helvetica", 12))
+    subtitle_label = tk.Label(root, text="Voice Detection Support" if voice_only else "Dependency Installer",
+                              font=("Helvetica", 12))
     subtitle_label.pack(pady=(0, 20))
     
     # Progress frame
@@ -111,69 +202,128 @@ def main():
     installation_complete = [False]
     installation_successful = [False]
     
+    # Tk isn't thread-safe: the installation thread only queues UI updates,
+    # and drain_ui_queue applies them on the main thread
+    ui_queue = queue.Queue()
+    
+    def drain_ui_queue():
+        log_lines = []
+        while True:
+            try:
+                op, args = ui_queue.get_nowait()
+            except queue.Empty:
+                break
+                
+            if op == "log":
+                log_lines.append(args[0])
+            elif op == "progress":
+                progress_var.set(args[0])
+                status_var.set(args[1])
+            elif op == "config":
+                args[0].config(**args[1])
+                
+        # pip can emit hundreds of lines a second; write everything that
+        # arrived since the last poll in one insert and scroll once
+        if log_lines:
+            log_text.config(state="normal")
+            log_text.insert("end", "\n".join(log_lines) + "\n")
+            
+            # Keep the log bounded - drop the oldest lines past the limit
+            line_count = int(log_text.index("end-1c").split(".")[0])
+            if line_count > LOG_MAX_LINES:
+                log_text.delete("1.0", f"{line_count - LOG_MAX_LINES + 1}.0")
+                
+            log_text.see("end")
+            log_text.config(state="disabled")
+                
+        root.after(50, drain_ui_queue)
+    
     # Add log message
     def add_log(message):
-        log_text.config(state="normal")
-        log_text.insert("end", message + "\n")
-        log_text.see("end")
-        log_text.config(state="disabled")
-        root.update_idletasks()
+        ui_queue.put(("log", (message,)))
     
     # Update progress
     def update_progress(value, status):
-        progress_var.set(value)
-        status_var.set(status)
-        root.update_idletasks()
+        ui_queue.put(("progress", (value, status)))
+        
+    # Change a widget's options
+    def configure_widget(widget, **options):
+        ui_queue.put(("config", (widget, options)))
+    
+    # Run a command, streaming its combined stdout/stderr to the log line by
+    # line instead of buffering it all until the process exits
+    def run_streamed(command, on_line=None, **kwargs):
+        process = subprocess.Popen(command,
+                                   stdout=subprocess.PIPE,
+                                   stderr=subprocess.STDOUT,
+                                   bufsize=1,
+                                   text=True,
+                                   **kwargs)
+        for line in process.stdout:
+            line = line.rstrip()
+            add_log(line)
+            if on_line is not None:
+                on_line(line)
+        return process.wait()
+    
+    # Build an on_line handler that moves the progress bar from base to
+    # base + span as pip works through the given packages
+    def pip_progress(packages, base, span):
+        wanted = {normalize_package_name(package) for package in packages}
+        collected = set()
+        
+        def on_line(line):
+            match = PIP_PROGRESS_RE.match(line)
+            if not match:
+                return
+                
+            action, target = match.groups()
+            if action == "Collecting":
+                # Collection covers most of the wall time (downloads included)
+                name = normalize_package_name(re.split(r"[<>=!~;\[(]", target)[0])
+                if name in wanted:
+                    collected.add(name)
+                update_progress(base + span * 0.8 * len(collected) / len(wanted), f"Collecting {name}...")
+            elif action == "Downloading":
+                update_progress(base + span * 0.8 * len(collected) / len(wanted), f"Downloading {target}...")
+            elif action == "Building wheel for":
+                update_progress(base + span * 0.8 * len(collected) / len(wanted), f"Building {target}...")
+            elif action == "Installing collected packages:":
+                update_progress(base + span * 0.9, "Installing packages...")
+                
+        return on_line
     
     # Install portaudio if needed
     def install_portaudio():
         try:
-            # Check if PyAudio can be imported
-            try:
-                import pyaudio
-                add_log("✓ PyAudio already installed")
-                return True
-            except ImportError:
-                pass
-                
-            add_log("Installing portaudio with homebrew (required for PyAudio)...")
+            add_log("Installing portaudio with homebrew (required to build PyAudio)...")
             update_progress(0.2, "Installing portaudio...")
             
-            # Check if homebrew is installed
-            which_process = subprocess.run(["which", "brew"], 
-                                         capture_output=True, 
-                                         text=True)
+            # Bootstrapping Homebrew is minutes of downloads and an admin
+            # prompt just to build one package - leave that to the user
+            brew = find_brew()
+            if brew is None:
+                add_log("❌ Homebrew not found and no PyAudio wheel available.")
+                add_log("Either add a PyAudio wheel to the wheels/ folder, or install Homebrew and run:")
+                add_log("   brew install portaudio")
+                return False
             
-            if which_process.returncode != 0:
-                add_log("❌ Homebrew not found. Installing Homebrew...")
-                update_progress(0.3, "Installing Homebrew...")
-                
-                brew_install = subprocess.run(["/bin/bash", "-c", 
-                                             '$(curl -fsSL https://raw.githubusercontent.com/Homebrew/install/HEAD/install.sh)'],
-                                            capture_output=True,
-                                            text=True)
-                
-                if brew_install.returncode != 0:
-                    add_log("❌ Failed to install Homebrew. Please install manually.")
-                    add_log("Run this command in Terminal:")
-                    add_log('   /bin/bash -c "$(curl -fsSL https://raw.githubusercontent.com/Homebrew/install/HEAD/install.sh)"')
-                    return False
-                else:
-                    add_log("✓ Homebrew installed successfully")
+            # Already there? 'brew list' answers far faster than 'brew install'
+            # works out that there's nothing to do
+            if subprocess.run([brew, "list", "--versions", "portaudio"],
+                              capture_output=True).returncode == 0:
+                add_log("✓ Portaudio already installed")
+                return True
             
             # Install portaudio with homebrew
             add_log("Installing portaudio...")
             update_progress(0.4, "Installing portaudio...")
             
-            portaudio_process = subprocess.run(["brew", "install", "portaudio"], 
-                                             capture_output=True, 
-                                             text=True)
-            
-            if portaudio_process.returncode == 0:
+            if run_streamed([brew, "install", "portaudio"]) == 0:
                 add_log("✓ Portaudio installed successfully")
                 return True
             else:
-                add_log(f"❌ Failed to install portaudio: {portaudio_process.stderr}")
+                add_log("❌ Failed to install portaudio")
                 add_log("You may need to install it manually:")
                 add_log("   brew install portaudio")
                 return False
@@ -182,96 +332,174 @@ def main():
             add_log(f"❌ Error installing portaudio: {str(e)}")
             return False
     
-    # Install Python dependencies
-    def install_dependencies():
-        try:
-            missing = []
-            progress_step = 1
-            
-            # Upgrade pip first
+    # Install PyAudio from a prebuilt wheel (one with portaudio linked in,
+    # from the wheelhouse or PyPI), only building it against Homebrew's
+    # portaudio when no wheel fits this machine
+    def install_pyaudio():
+        add_log("Installing pyaudio...")
+        if run_pip_install(["pyaudio"], only_binary=["pyaudio"]) == 0:
+            add_log("✓ Successfully installed pyaudio")
+            return True
+        
+        add_log("⚠️ No PyAudio wheel for this Mac, building from source...")
+        if not install_portaudio():
+            add_log("⚠️ Portaudio installation may have failed, attempting to install PyAudio anyway...")
+        if run_pip_install(["pyaudio"]) == 0:
+            add_log("✓ Successfully installed pyaudio")
+            return True
+        add_log("❌ Failed to install pyaudio")
+        return False
+    
+    # Run pip install for the given packages, streaming its output to the log
+    def run_pip_install(packages, only_binary=(), offline=False, on_line=None, find_links=()):
+        command = PIP_COMMAND + ["install", "--prefer-binary", "--cache-dir", PIP_CACHE_DIR]
+        if offline:
+            command += ["--no-index", "--find-links", WHEELHOUSE_DIR]
+        else:
+            # Still offer the bundled and pre-downloaded wheels alongside PyPI
+            if os.path.isdir(WHEELHOUSE_DIR):
+                command += ["--find-links", WHEELHOUSE_DIR]
+            for links in find_links:
+                command += ["--find-links", links]
+        if os.path.exists(REQUIREMENTS_FILE):
+            # Hold every package (direct or transitive) to the pinned ranges
+            command += ["-c", REQUIREMENTS_FILE]
+        if only_binary:
+            command += ["--only-binary", ",".join(only_binary)]
+        return run_streamed(command + list(packages), on_line=on_line, env=PIP_ENV)
+    
+    # Fetch the packages' distributions side by side - a single pip run
+    # downloads one file at a time. --no-deps keeps each run to its own
+    # package; anything transitive is still fetched by the install itself
+    def download_packages(packages, download_dir):
+        def download(dep):
+            command = PIP_COMMAND + ["download", "--no-deps", "--prefer-binary",
+                                     "--cache-dir", PIP_CACHE_DIR, "-d", download_dir]
+            if os.path.exists(REQUIREMENTS_FILE):
+                command += ["-c", REQUIREMENTS_FILE]
+            if dep in BINARY_ONLY_PACKAGES:
+                command += ["--only-binary", dep]
+            return subprocess.run(command + [dep], capture_output=True, env=PIP_ENV).returncode == 0
+        
+        with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as executor:
+            for dep, downloaded in zip(packages, executor.map(download, packages)):
+                if downloaded:
+                    add_log(f"✓ Downloaded {dep}")
+                else:
+                    add_log(f"⚠️ Couldn't pre-download {dep}, pip will fetch it during install")
+    
+    # Upgrade pip and install the given packages; returns the ones that failed
+    def install_packages(packages):
+        missing = []
+        progress_step = 1
+        
+        # Bundled wheels first - no network, and no pip upgrade or portaudio
+        # build needed if they cover everything
+        if os.path.isdir(WHEELHOUSE_DIR):
+            add_log("Installing from local wheelhouse...")
+            update_progress(progress_step, "Installing from local wheels...")
+            on_line = pip_progress(packages, progress_step, len(dependencies) - progress_step)
+            if run_pip_install(packages, offline=True, on_line=on_line) == 0:
+                add_log("✓ Successfully installed all dependencies from local wheels")
+                return missing
+            add_log("⚠️ Local wheels incomplete, installing from PyPI...")
+        
+        # Upgrade pip first, unless it's already recent enough - the upgrade
+        # is a network round-trip and resolver run on every install
+        current_pip = pip_version()
+        if current_pip is not None and current_pip >= MIN_PIP_VERSION:
+            add_log(f"✓ Pip {'.'.join(map(str, current_pip))} is up to date")
+        else:
             add_log("Upgrading pip...")
             update_progress(progress_step, "Upgrading pip...")
             
-            pip_upgrade = subprocess.run([sys.executable, "-m", "pip", "install", "--upgrade", "pip"],
-                                       capture_output=True,
-                                       text=True)
+            pip_upgrade = run_streamed(PIP_COMMAND + ["install", "--upgrade",
+                                                      "--cache-dir", PIP_CACHE_DIR, "pip"],
+                                       env=PIP_ENV)
             
-            if pip_upgrade.returncode == 0:
+            if pip_upgrade == 0:
                 add_log("✓ Pip upgraded successfully")
             else:
                 add_log("❌ Failed to upgrade pip, continuing with installations...")
+        
+        progress_step += 1
+        
+        # PyAudio goes on its own so a missing wheel can fall back to a
+        # source build without dragging the whole batch down with it
+        if "pyaudio" in packages:
+            if not install_pyaudio():
+                missing.append("pyaudio")
+            packages = [dep for dep in packages if dep != "pyaudio"]
+            if not packages:
+                return missing
+        
+        # A fresh directory each run, so no stale or outdated downloads pile
+        # up or get picked; pip's own cache still saves re-downloading
+        with tempfile.TemporaryDirectory(prefix="imac-security-downloads-") as download_dir:
+            update_progress(progress_step, "Downloading dependencies...")
+            add_log(f"Downloading {', '.join(packages)}...")
+            download_packages(packages, download_dir)
             
-            progress_step += 1
+            # Install everything in one pip run - one interpreter start-up and
+            # one resolver pass instead of one per package
+            update_progress(progress_step, "Installing dependencies...")
+            add_log(f"Installing {', '.join(packages)}...")
             
-            # Install each dependency
+            binary_only = [dep for dep in packages if dep in BINARY_ONLY_PACKAGES]
+            on_line = pip_progress(packages, progress_step, len(dependencies) - progress_step)
+            if run_pip_install(packages, only_binary=binary_only, on_line=on_line,
+                               find_links=[download_dir]) == 0:
+                add_log("✓ Successfully installed all dependencies")
+            else:
+                # A single bad package fails the whole batch; retry one by one
+                # (allowing source builds) so the others still get installed
+                # and we know which failed
+                add_log("⚠️ Batch install failed, installing packages individually...")
+                for dep in packages:
+                    add_log(f"Installing {dep}...")
+                    if run_pip_install([dep], find_links=[download_dir]) == 0:
+                        add_log(f"✓ Successfully installed {dep}")
+                    else:
+                        add_log(f"❌ Failed to install {dep}")
+                        missing.append(dep)
+        
+        return missing
+    
+    # Install Python dependencies
+    def install_dependencies():
+        try:
+            # Only hand pip what isn't importable yet
+            to_install = [dep for dep in dependencies if not module_available(dep)]
             for dep in dependencies:
-                update_progress(progress_step, f"Installing {dep}...")
-                add_log(f"Installing {dep}...")
-                
-                # Special handling for pyaudio on macOS
-                if dep == "pyaudio" and sys.platform.startswith('darwin'):
-                    if not install_portaudio():
-                        add_log("⚠️ Portaudio installation may have failed, attempting to install PyAudio anyway...")
-                
-                # Install the dependency
-                install_process = subprocess.run([sys.executable, "-m", "pip", "install", dep],
-                                              capture_output=True,
-                                              text=True)
-                
-                if install_process.returncode == 0:
-                    add_log(f"✓ Successfully installed {dep}")
-                else:
-                    add_log(f"❌ Failed to install {dep}: {install_process.stderr}")
-                    missing.append(dep)
-                
-                progress_step += 1
+                if dep not in to_install:
+                    add_log(f"✓ {dep} already installed")
+            
+            if to_install:
+                missing = install_packages(to_install)
+            else:
+                add_log("All dependencies already installed, nothing to download")
+                missing = []
             
             # Verify installations
             update_progress(len(dependencies), "Verifying installations...")
             add_log("\nVerifying installations...")
             
-            verification_failures = []
-            try:
-                import cv2
-                add_log("✓ OpenCV installed")
-            except ImportError:
-                add_log("❌ OpenCV verification failed")
-                verification_failures.append("opencv-python")
-                
-            try:
-                import numpy
-                add_log("✓ NumPy installed")
-            except ImportError:
-                add_log("❌ NumPy verification failed")
-                verification_failures.append("numpy")
-                
-            try:
-                import pyaudio
-                add_log("✓ PyAudio installed")
-            except ImportError:
-                add_log("❌ PyAudio verification failed")
-                verification_failures.append("pyaudio")
-                
-            try:
-                import speech_recognition
-                add_log("✓ SpeechRecognition installed")
-            except ImportError:
-                add_log("❌ SpeechRecognition verification failed")
-                verification_failures.append("SpeechRecognition")
-                
-            try:
-                import PIL
-                add_log("✓ Pillow installed")
-            except ImportError:
-                add_log("❌ Pillow verification failed")
-                verification_failures.append("Pillow")
+            # pip has just added files to site-packages; drop the import
+            # system's cached directory listings so the lookups see them
+            importlib.invalidate_caches()
+            
+            # Look the modules up concurrently
+            with ThreadPoolExecutor(max_workers=len(dependencies)) as executor:
+                found = list(executor.map(module_available, dependencies))
                 
-            try:
-                import ttkbootstrap
-                add_log("✓ ttkbootstrap installed")
-            except ImportError:
-                add_log("❌ ttkbootstrap verification failed")
-                verification_failures.append("ttkbootstrap")
+            verification_failures = []
+            for dep, available in zip(dependencies, found):
+                name = PKG_DISPLAY_NAMES.get(dep, dep)
+                if available:
+                    add_log(f"✓ {name} installed")
+                else:
+                    add_log(f"❌ {name} verification failed")
+                    verification_failures.append(dep)
             
             # Final status
             if not missing and not verification_failures:
@@ -296,28 +524,22 @@ def main():
             update_progress(len(dependencies) + 1, "Installation failed")
             return False
     
-    # Launch main application
+    # Launch main application - on success this replaces the installer
+    # process and doesn't return
     def launch_main_app():
-        try:
-            add_log("\nLaunching iMac Security System...")
-            
-            # Get the directory of this script
-            script_dir = os.path.dirname(os.path.abspath(__file__))
-            main_script = os.path.join(script_dir, "imac_security.py")
-            
-            if os.path.exists(main_script):
-                # Run the main script
-                subprocess.Popen([sys.executable, main_script])
-                add_log("✅ Application launched successfully!")
-            else:
-                add_log(f"❌ Main script not found at: {main_script}")
-                add_log("Please make sure imac_security.py is in the same directory.")
-                return False
-                
-            return True
-        except Exception as e:
-            add_log(f"❌ Error launching application: {str(e)}")
+        main_script = find_main_script()
+        if not main_script:
+            add_log(f"❌ Main script not found in: {os.path.dirname(os.path.abspath(__file__))}")
+            add_log("Please make sure imac-security.py is in the same directory.")
             return False
+            
+        # Tear down the installer window before the process image goes away
+        root.destroy()
+        try:
+            exec_main_script(main_script)
+        except OSError as e:
+            print(f"Error launching application: {e}")
+            sys.exit(1)
     
     # Main installation thread
     def installation_thread():
@@ -325,40 +547,157 @@ def main():
             success = install_dependencies()
             installation_successful[0] = success
             
-            if success:
+            if voice_only:
+                # The app that started us is still running; nothing to launch
+                add_log("\nVoice detection support is ready." if success else
+                        "\nVoice detection dependencies could not be installed.")
+                update_progress(len(dependencies) + 1, "Installation complete!")
+                configure_widget(start_button, text="Done", command=root.destroy, state="normal")
+            elif success:
+                # Lets the next run skip straight to launching
+                write_install_stamp(install_key(dependencies))
                 add_log("\nReady to launch the application!")
                 update_progress(len(dependencies) + 1, "Installation complete!")
-                start_button.config(text="Launch Application", command=launch_and_close)
+                configure_widget(start_button, text="Launch Application", command=launch_and_close, state="normal")
             else:
                 add_log("\nInstallation completed with issues. You may need to install some dependencies manually.")
                 add_log("You can still try to launch the application.")
-                start_button.config(text="Launch Anyway", command=launch_and_close)
+                configure_widget(start_button, text="Launch Anyway", command=launch_and_close, state="normal")
             
-            cancel_button.config(text="Close")
+            configure_widget(cancel_button, text="Close", state="normal")
             installation_complete[0] = True
         except Exception as e:
             add_log(f"\n❌ Error during installation: {str(e)}")
-            start_button.config(text="Retry Installation", command=start_installation)
-            cancel_button.config(text="Close")
+            configure_widget(start_button, text="Retry Installation", command=start_installation, state="normal")
+            configure_widget(cancel_button, text="Close", state="normal")
             installation_complete[0] = True
     
     # Start installation
     def start_installation():
         start_button.config(state="disabled")
         cancel_button.config(state="disabled")
+        # A thread is enough: the compiling and downloading happen in pip/brew
+        # child processes, and this worker just blocks on their output pipes
+        # with the GIL released, so Tk isn't starved while they run
         threading.Thread(target=installation_thread, daemon=True).start()
     
     # Launch and close
     def launch_and_close():
-        if launch_main_app():
-            root.destroy()
+        launch_main_app()
     
     # Set button command
     start_button.config(command=start_installation)
     
     # Run the GUI
+    root.deiconify()
+    root.after(50, drain_ui_queue)
     root.mainloop()
 
+def find_main_script():
+    """Path of the main program next to this script, or None"""
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    for name in ("imac-security.py", "imac_security.py"):
+        path = os.path.join(script_dir, name)
+        if os.path.exists(path):
+            return path
+    return None
+
+def exec_main_script(main_script):
+    """Replace this process with the main program (doesn't return on success)
+    
+    exec rather than spawning a child: no second interpreter alongside the
+    installer, and the app inherits this process (and its terminal).
+    """
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os.execv(sys.executable, [sys.executable, main_script])
+
+def install_key(dependencies):
+    """Identifies an install: the interpreter plus the dependency list"""
+    parts = [sys.version, sys.executable] + sorted(dependencies)
+    if os.path.exists(REQUIREMENTS_FILE):
+        with open(REQUIREMENTS_FILE) as f:
+            parts.append(f.read())
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()
+
+def read_install_stamp():
+    try:
+        with open(INSTALL_STAMP) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+def write_install_stamp(key):
+    try:
+        os.makedirs(os.path.dirname(INSTALL_STAMP), exist_ok=True)
+        with open(INSTALL_STAMP, "w") as f:
+            f.write(key)
+    except OSError as e:
+        print(f"Could not write install stamp: {e}")
+
+def clear_install_stamp():
+    try:
+        os.remove(INSTALL_STAMP)
+    except OSError:
+        pass
+
+_brew_path = None
+
+def find_brew():
+    """Path to the brew executable, or None (looked up once, then cached)"""
+    global _brew_path
+    if _brew_path is None:
+        _brew_path = shutil.which("brew", path=BREW_SEARCH_PATH)
+    return _brew_path
+
+def read_requirements(path):
+    """Package names listed in a requirements file, or [] if it can't be read"""
+    try:
+        with open(path) as f:
+            lines = [line.split("#")[0].strip() for line in f]
+    except OSError:
+        return []
+        
+    names = []
+    for line in lines:
+        if line:
+            for separator in "<>=!~;[ ":
+                line = line.split(separator)[0]
+            names.append(line)
+    return names
+
+def normalize_package_name(name):
+    """PEP 503 normalised form, so 'PyAudio' and 'pyaudio' compare equal"""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+def module_available(package):
+    """Check if a pip package's module can be found
+    
+    find_spec locates the module without importing it, so cv2 & co. don't
+    have to load their native libraries just to be checked.
+    """
+    try:
+        return importlib.util.find_spec(PKG_TO_MODULE.get(package, package)) is not None
+    except (ImportError, ValueError):
+        # ValueError: already in sys.modules without a __spec__ (e.g. a
+        # half-initialised module); either way it isn't usable as installed
+        return False
+
+def pip_version():
+    """Installed pip's version as a tuple of ints, or None if it can't be read"""
+    try:
+        from importlib.metadata import version, PackageNotFoundError
+    except ImportError:
+        # Python 3.7 has no importlib.metadata
+        return None
+    try:
+        match = re.match(r"\d+(\.\d+)*", version("pip"))
+    except PackageNotFoundError:
+        return None
+    if match is None:
+        return None
+    return tuple(int(part) for part in match.group(0).split("."))
+
 def tk_available():
     """Check if tkinter is available"""
     try:
@@ -10,8 +10,14 @@ import os
 import sys
 import time
 import threading
+import queue
 import subprocess
+import shutil
 import json
+import collections
+import heapq
+import functools
+import importlib
 import argparse
 import logging
 import tkinter as tk
@@ -61,10 +67,15 @@ try:
     import cv2
     import numpy as np
     import datetime
-    import pyaudio
     import wave
-    import speech_recognition as sr
-    from PIL import Image, ImageTk
+    
+    # Voice support is optional - the installer leaves pyaudio and
+    # SpeechRecognition out until voice detection is first switched on
+    try:
+        import pyaudio
+        import speech_recognition as sr
+    except ImportError:
+        pyaudio = sr = None
     
     # Try to import ttkbootstrap but have a fallback
     USE_TTKBOOTSTRAP = True
@@ -77,16 +88,69 @@ try:
         # Define constants for standard ttk (they won't be used the same way, but prevent errors)
         SUCCESS, DANGER, INFO, SECONDARY = "success", "danger", "info", "secondary"
         USE_TTKBOOTSTRAP = False
+        
+    # PyObjC's AVFoundation bridge (optional) lists cameras without opening them
+    try:
+        import AVFoundation
+    except ImportError:
+        AVFoundation = None
 except ImportError as e:
     if 'tkinter' not in str(e).lower():  # Don't show error for tkinter when in headless mode
-        print(f"Missing dependency: {e}\n\nPlease run: pip install opencv-python numpy pyaudio SpeechRecognition Pillow ttkbootstrap")
+        print(f"Missing dependency: {e}\n\nPlease run: pip install opencv-python numpy ttkbootstrap")
         sys.exit(1)
 
+# Installer that sits next to this script; run with --voice it adds just the
+# voice detection dependencies
+INSTALLER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "imac-security-installer.py")
+
+def install_voice_support():
+    """Install pyaudio and SpeechRecognition if needed and import them (blocks)
+    
+    Returns True once both modules are available.
+    """
+    global pyaudio, sr
+    if pyaudio is not None and sr is not None:
+        return True
+        
+    if os.path.exists(INSTALLER_SCRIPT):
+        subprocess.run([sys.executable, INSTALLER_SCRIPT, "--voice"])
+    else:
+        subprocess.run([sys.executable, "-m", "pip", "install", "pyaudio", "SpeechRecognition"])
+        
+    importlib.invalidate_caches()
+    try:
+        import pyaudio
+        import speech_recognition as sr
+    except ImportError as e:
+        print(f"Voice detection support not installed: {e}")
+        pyaudio = sr = None
+        return False
+    return True
+
+# Button style keyword arguments, e.g. ttk.Button(..., **STYLE_SUCCESS).
+# ttkbootstrap takes bootstyle=<constant>, plain ttk takes style=<name>.
+STYLE_SUCCESS = STYLE_DANGER = STYLE_INFO = STYLE_SECONDARY = {}
+
+def init_button_styles():
+    """Build the STYLE_* dicts once the ttk flavour is settled"""
+    global STYLE_SUCCESS, STYLE_DANGER, STYLE_INFO, STYLE_SECONDARY
+    if USE_TTKBOOTSTRAP:
+        STYLE_SUCCESS = {"bootstyle": SUCCESS}
+        STYLE_DANGER = {"bootstyle": DANGER}
+        STYLE_INFO = {"bootstyle": INFO}
+        STYLE_SECONDARY = {"bootstyle": SECONDARY}
+    else:
+        STYLE_SUCCESS = {"style": "Success.TButton"}
+        STYLE_DANGER = {"style": "Danger.TButton"}
+        STYLE_INFO = {"style": "Info.TButton"}
+        STYLE_SECONDARY = {"style": "Secondary.TButton"}
+
 # Configuration manager
 class ConfigManager:
     def __init__(self):
         self.config_path = os.path.expanduser("~/Library/Application Support/iMacSecuritySystem")
         self.config_file = os.path.join(self.config_path, "config.json")
+        self._dirty = False  # Changed in memory since the last write
         
         # Create config directory if it doesn't exist
         if not os.path.exists(self.config_path):
@@ -108,6 +172,7 @@ class ConfigManager:
             "notifications_enabled": True,
             "dark_mode": True,
             "use_simple_motion_detection": True,  # Default to faster motion detection
+            "motion_detect_stride": 2,  # Run motion detection on every Nth frame
             "selected_camera_index": 0,
             "selected_microphone_index": None  # Default to system default mic
         }
@@ -116,8 +181,7 @@ class ConfigManager:
         if not os.path.exists(default_config["output_directory"]):
             os.makedirs(default_config["output_directory"])
             
-        with open(self.config_file, 'w') as f:
-            json.dump(default_config, f, indent=4)
+        self._write_config(default_config)
             
         return default_config
             
@@ -129,6 +193,8 @@ class ConfigManager:
                 # Add new configuration options if they don't exist (for upgrades)
                 if "use_simple_motion_detection" not in config:
                     config["use_simple_motion_detection"] = True
+                if "motion_detect_stride" not in config:
+                    config["motion_detect_stride"] = 2
                 if "video_resolution" not in config:
                     config["video_resolution"] = "480p"
                 if "selected_microphone_index" not in config:
@@ -139,11 +205,109 @@ class ConfigManager:
             return self.create_default_config()
                 
     def save_config(self):
-        with open(self.config_file, 'w') as f:
-            json.dump(self.config, f, indent=4)
+        self._write_config(self.config)
+        self._dirty = False
+        
+    def mark_dirty(self):
+        """Note an in-memory change to be written by the next save_if_dirty()"""
+        self._dirty = True
+        
+    def save_if_dirty(self):
+        if self._dirty:
+            self.save_config()
+        
+    def _write_config(self, config):
+        """Atomically replace the config file so a crash can't leave it half-written"""
+        tmp_file = self.config_file + ".tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump(config, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.config_file)
+
+# Hardware video encoding
+class FFmpegVideoWriter:
+    """Pipe raw BGR frames to ffmpeg's h264_videotoolbox encoder
+    
+    Mirrors the parts of cv2.VideoWriter that CameraManager uses
+    (write, release, isOpened) so the two can be swapped freely.
+    """
+    # Homebrew's bin directories are often missing from PATH when launched from Finder
+    SEARCH_PATH = os.pathsep.join([os.environ.get("PATH", ""), "/opt/homebrew/bin", "/usr/local/bin"])
+    _ffmpeg_path = None
+    
+    @classmethod
+    def available(cls):
+        """Return True if an ffmpeg binary can be found"""
+        if cls._ffmpeg_path is None:
+            cls._ffmpeg_path = shutil.which("ffmpeg", path=cls.SEARCH_PATH) or ""
+        return bool(cls._ffmpeg_path)
+        
+    def __init__(self, filename, fps, frame_size):
+        self.frame_width, self.frame_height = frame_size
+        self.process = None
+        
+        if not self.available():
+            return
+            
+        command = [
+            self._ffmpeg_path, "-loglevel", "error", "-y",
+            "-f", "rawvideo", "-pix_fmt", "bgr24",
+            "-s", f"{self.frame_width}x{self.frame_height}",
+            "-r", str(fps),
+            "-i", "-",
+            "-c:v", "h264_videotoolbox", "-b:v", "4M", "-realtime", "1",
+            "-allow_sw", "1",  # VideoToolbox's software encoder if no hardware session is free
+            "-pix_fmt", "yuv420p",
+            filename
+        ]
+        try:
+            self.process = subprocess.Popen(command, stdin=subprocess.PIPE,
+                                            stdout=subprocess.DEVNULL,
+                                            stderr=subprocess.DEVNULL)
+        except Exception as e:
+            print(f"Error starting ffmpeg encoder: {e}")
+            self.process = None
+            
+    def isOpened(self):
+        return self.process is not None and self.process.poll() is None
+        
+    def write(self, frame):
+        if not self.isOpened():
+            return
+            
+        # The raw stream has a fixed frame size, so scale anything that doesn't match
+        if frame.shape[1] != self.frame_width or frame.shape[0] != self.frame_height:
+            frame = cv2.resize(frame, (self.frame_width, self.frame_height))
+            
+        try:
+            self.process.stdin.write(frame.tobytes())
+        except (BrokenPipeError, OSError) as e:
+            print(f"ffmpeg encoder stopped unexpectedly: {e}")
+            self.release()
+            
+    def release(self):
+        if self.process is None:
+            return
+            
+        try:
+            self.process.stdin.close()
+            self.process.wait(timeout=10)
+        except Exception as e:
+            print(f"Error closing ffmpeg encoder: {e}")
+            self.process.kill()
+        self.process = None
 
 # Camera and motion detection
 class CameraManager:
+    DILATE_KERNEL = np.ones((3, 3), dtype=np.uint8)
+    MJPG_FOURCC = cv2.VideoWriter_fourcc('M', 'J', 'P', 'G')  # Camera capture format
+    MP4V_FOURCC = cv2.VideoWriter_fourcc(*'mp4v')            # Software recording codec
+    # Capture buffers to cycle through: enough for everything that can hold a
+    # frame at once (the ring, the latest frame, one handed to detection, one
+    # handed to the preview) plus the one being decoded into
+    CAPTURE_POOL_SIZE = 6
+    
     def __init__(self, config):
         self.config = config
         self.camera = None
@@ -166,41 +330,91 @@ class CameraManager:
             self.frame_width = 640
             self.frame_height = 480
             
+        # Pixel count of the (half-resolution) motion frame; the sensitivity
+        # setter turns sensitivity into absolute changed-pixel thresholds
+        self._motion_pixels = (self.frame_height // 2) * (self.frame_width // 2)
         self.motion_sensitivity = config["motion_sensitivity"]
         self.post_detection_record_time = config["post_detection_record_time"]
         self.output_directory = config["output_directory"]
         
         # Use a simpler background subtractor for better performance
         self.background_subtractor = cv2.createBackgroundSubtractorMOG2(
-            history=50,     # Reduced history for better performance
-            varThreshold=30 # Lower threshold for better performance
+            history=50,           # Reduced history for better performance
+            varThreshold=50,      # Fewer false-foreground pixels for dilate to amplify
+            detectShadows=False   # Shadow detection is costly and we don't use it
         )
         
+        # Only analyse every Nth frame; recording windows are seconds long,
+        # so reusing the last decision in between doesn't delay triggers
+        self.motion_detect_stride = max(1, int(config.get("motion_detect_stride", 2)))
+        self._motion_frame_counter = 0
+        self._last_motion_result = False
+        
         # Add a previous frame for simpler motion detection
+        # (float32 running average)
         self.prev_frame = None
         
+        # Scratch buffers for the motion path, (re)allocated whenever the
+        # frame size changes so steady-state detection allocates nothing
+        self._small_buf = None
+        self._gray_buf = None
+        self._blur_buf = None
+        self._prev_gray_buf = None
+        self._delta_buf = None
+        self._thresh_buf = None
+        self._fgmask_buf = None
+        
+        # Bind detect_motion to the configured method
+        self.select_motion_method()
+        
         self.selected_camera_index = config.get("selected_camera_index", 0)
         
-    def get_available_cameras(self):
-        """Detect available cameras and return a list of their names and indices"""
+        # Background capture: a producer thread reads frames into a small
+        # ring (deque with maxlen, so the oldest frame falls off when full) and
+        # keeps the newest frame around for the preview, so camera I/O never
+        # blocks detection or the UI
+        self._frame_ring = collections.deque(maxlen=2)
+        self._frame_ready = threading.Condition()
+        self._latest_frame = None
+        self._latest_taken = True
+        self.latest_frame_seq = 0  # Bumped per captured frame; buffers are reused, so compare this, not identity
+        self._capture_thread = None
+        
+        # retrieve() decodes into recycled arrays instead of allocating a new
+        # one per frame. A buffer is reused only once nothing references it:
+        # not in the ring, not the latest frame, and not the frame last handed
+        # to detection (next_frame) or to the preview (get_latest_frame)
+        self._capture_pool = []
+        self._detect_frame = None
+        self._preview_frame = None
+        self._capture_stop = threading.Event()
+        
+        # Guards the capture device (reads vs. switching cameras) and the
+        # video writer (recording from a worker vs. stopping from the UI)
+        self._camera_lock = threading.Lock()
+        self._record_lock = threading.Lock()
+        
+    def get_available_cameras(self, refresh=False):
+        """Detect available cameras and return a list of their names and indices
+        
+        The result is cached; pass refresh=True to enumerate the devices again.
+        """
+        if self.available_cameras and not refresh:
+            return self.available_cameras
+            
         self.available_cameras = []
         
-        # Check for multiple camera indices (typically 0-10 is sufficient)
-        for i in range(10):
+        # Ask AVFoundation for the device list if PyObjC is installed - this is
+        # near-instant because no device has to be opened
+        if AVFoundation is not None:
             try:
-                temp_camera = cv2.VideoCapture(i)
-                if temp_camera.isOpened():
-                    # Get camera name if possible
-                    ret, frame = temp_camera.read()
-                    if ret:
-                        # Try to get device name, fall back to generic name if not possible
-                        camera_name = f"Camera {i}"
-                        if sys.platform.startswith('darwin'):  # macOS specific
-                            camera_name = f"Camera {i} (iMac)"
-                        self.available_cameras.append({"index": i, "name": camera_name})
-                    temp_camera.release()
+                self.available_cameras = self._list_avfoundation_cameras()
             except Exception as e:
-                print(f"Error checking camera {i}: {e}")
+                print(f"Error listing cameras via AVFoundation: {e}")
+                self.available_cameras = []
+                
+        if not self.available_cameras:
+            self.available_cameras = self._probe_cameras()
                 
         if not self.available_cameras:
             # If no cameras found, add a dummy entry
@@ -208,17 +422,67 @@ class CameraManager:
             
         return self.available_cameras
         
+    def _list_avfoundation_cameras(self):
+        """List video devices with the indices OpenCV's AVFoundation backend gives them"""
+        # OpenCV indexes video plus muxed devices, sorted by uniqueID - not
+        # AVFoundation's own enumeration order
+        capture_device = AVFoundation.AVCaptureDevice
+        devices = (list(capture_device.devicesWithMediaType_(AVFoundation.AVMediaTypeVideo)) +
+                   list(capture_device.devicesWithMediaType_(AVFoundation.AVMediaTypeMuxed)))
+        devices.sort(key=lambda device: str(device.uniqueID()))
+        cameras = []
+        seen_names = set()
+        for i, device in enumerate(devices):
+            camera_name = str(device.localizedName())
+            if camera_name in seen_names:
+                # Names select the camera in the UI, so keep them unique
+                camera_name = f"{camera_name} #{i}"
+            seen_names.add(camera_name)
+            cameras.append({"index": i, "name": camera_name})
+        return cameras
+        
+    def _probe_cameras(self):
+        """Fallback: open camera indices in turn until two in a row fail"""
+        cameras = []
+        misses = 0
+        
+        # Check for multiple camera indices (typically 0-10 is sufficient)
+        for i in range(10):
+            try:
+                temp_camera = cv2.VideoCapture(i, cv2.CAP_AVFOUNDATION)
+                # isOpened() is enough - grabbing a frame only slows enumeration down
+                if temp_camera.isOpened():
+                    misses = 0
+                    # Try to get device name, fall back to generic name if not possible
+                    camera_name = f"Camera {i}"
+                    if sys.platform.startswith('darwin'):  # macOS specific
+                        camera_name = f"Camera {i} (iMac)"
+                    cameras.append({"index": i, "name": camera_name})
+                else:
+                    misses += 1
+                temp_camera.release()
+            except Exception as e:
+                print(f"Error checking camera {i}: {e}")
+                misses += 1
+                
+            # Indices are contiguous, so two consecutive misses means we're done
+            if misses >= 2:
+                break
+                
+        return cameras
+        
     def set_camera(self, camera_index):
         """Switch to a different camera"""
         if self.is_recording:
             self.stop_recording()
             
-        if self.camera is not None:
-            self.camera.release()
-            
-        self.selected_camera_index = camera_index
-        self.config["selected_camera_index"] = camera_index
-        return self.open_camera()
+        with self._camera_lock:
+            if self.camera is not None:
+                self.camera.release()
+                
+            self.selected_camera_index = camera_index
+            self.config["selected_camera_index"] = camera_index
+            return self.open_camera()
         
     def open_camera(self):
         try:
@@ -229,143 +493,437 @@ class CameraManager:
                 
             self.camera = cv2.VideoCapture(index)
             
-            # Set resolution
-            self.camera.set(cv2.CAP_PROP_FRAME_WIDTH, self.frame_width)
-            self.camera.set(cv2.CAP_PROP_FRAME_HEIGHT, self.frame_height)
-            
-            # Set additional camera properties for better performance
-            self.camera.set(cv2.CAP_PROP_FPS, 10)  # Lower FPS for better performance
-            self.camera.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc('M','J','P','G'))  # Use MJPG format
-            
             if not self.camera.isOpened():
                 print(f"Failed to open camera at index {index}, trying fallback to index 0")
                 self.camera.release()
                 self.camera = cv2.VideoCapture(0)  # Fallback to default camera
-                self.camera.set(cv2.CAP_PROP_FRAME_WIDTH, self.frame_width)
-                self.camera.set(cv2.CAP_PROP_FRAME_HEIGHT, self.frame_height)
-                self.camera.set(cv2.CAP_PROP_FPS, 10)
-                self.camera.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc('M','J','P','G'))
-            
-            return self.camera.isOpened()
+                
+            # Configure whichever device actually opened, once
+            if self.camera.isOpened():
+                self._apply_props(self.camera)
+                return True
+                
+            return False
         except Exception as e:
             print(f"Error opening camera: {e}")
             return False
             
+    def _apply_props(self, camera):
+        """Apply resolution and performance settings to an opened capture device"""
+        # Set resolution
+        camera.set(cv2.CAP_PROP_FRAME_WIDTH, self.frame_width)
+        camera.set(cv2.CAP_PROP_FRAME_HEIGHT, self.frame_height)
+        
+        # Set additional camera properties for better performance
+        camera.set(cv2.CAP_PROP_FPS, 10)  # Lower FPS for better performance
+        camera.set(cv2.CAP_PROP_FOURCC, self.MJPG_FOURCC)  # Use MJPG format
+        camera.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # Don't let stale frames queue up in the driver
+        
     def release_camera(self):
-        if self.camera is not None:
-            self.camera.release()
+        self.stop_capture()
+        with self._camera_lock:
+            if self.camera is not None:
+                self.camera.release()
             
     def get_frame(self):
         if self.camera is None:
             return None
             
-        ret, frame = self.camera.read()
+        with self._camera_lock:
+            ret, frame = self.camera.read()
         if not ret:
             return None
             
         return frame
         
-    def detect_motion(self, frame):
-        if frame is None:
-            return False
-            
-        # Option 1: Simple frame difference method (faster)
-        if self.config.get("use_simple_motion_detection", True):
-            # Convert to grayscale
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            gray = cv2.GaussianBlur(gray, (21, 21), 0)
+    def start_capture(self):
+        """Start the background thread that reads frames from the camera"""
+        if self._capture_thread is not None and self._capture_thread.is_alive():
+            return
             
-            # If first frame, initialize and return
-            if self.prev_frame is None:
-                self.prev_frame = gray
-                return False
+        self._capture_stop.clear()
+        self._capture_thread = threading.Thread(target=self._capture_loop, daemon=True)
+        self._capture_thread.start()
+        
+    def stop_capture(self):
+        """Stop the background capture thread"""
+        self._capture_stop.set()
+        if self._capture_thread is not None:
+            self._capture_thread.join(timeout=2)
+            self._capture_thread = None
+            
+    def _capture_loop(self):
+        """Producer: grab every frame, but only decode the ones someone will use"""
+        while not self._capture_stop.is_set():
+            frame = None
+            with self._camera_lock:
+                # grab() keeps the driver queue drained so we stay on the
+                # newest frame; retrieve() (the decode) is paid only when a
+                # consumer is ready for another frame
+                grabbed = self.camera is not None and self.camera.grab()
+                if grabbed and self._frame_wanted():
+                    buf = self._free_capture_buffer()
+                    ret, frame = self.camera.retrieve(buf)
+                    if not ret:
+                        frame = None
+                    elif frame is not buf:
+                        # OpenCV allocated a new array: the pool is still
+                        # filling up, or the camera's frame size changed
+                        self._keep_capture_buffer(buf, frame)
+                    
+            if not grabbed:
+                # Camera missing or switching - back off briefly
+                self._capture_stop.wait(0.1)
+                continue
                 
-            # Calculate absolute difference between current and previous frame
-            frame_delta = cv2.absdiff(self.prev_frame, gray)
-            thresh = cv2.threshold(frame_delta, 25, 255, cv2.THRESH_BINARY)[1]
-            
-            # Update previous frame for next time (with some averaging for stability)
-            self.prev_frame = cv2.addWeighted(self.prev_frame, 0.7, gray, 0.3, 0)
-            
-            # Count white pixels (changed pixels)
-            white_pixel_count = np.sum(thresh == 255)
-            total_pixels = thresh.shape[0] * thresh.shape[1]
-            movement_percentage = (white_pixel_count / total_pixels) * 100
-            
-            # Adjust threshold based on sensitivity
-            threshold = (30 - self.motion_sensitivity) / 5  # Range: 1 to 5.8
+            if frame is None:
+                # Nobody is waiting for this one - drop it undecoded
+                continue
+                
+            # The deque drops the oldest frame if the consumer has fallen behind
+            with self._frame_ready:
+                self._latest_frame = frame
+                self._latest_taken = False
+                self.latest_frame_seq += 1
+                self._frame_ring.append(frame)
+                self._frame_ready.notify()
+                
+    def _free_capture_buffer(self):
+        """A pooled buffer nothing else holds, or None to let OpenCV allocate"""
+        with self._frame_ready:
+            busy = list(self._frame_ring) + [self._latest_frame, self._detect_frame, self._preview_frame]
+            
+        # Consumers only ever take frames that are already busy, so a buffer
+        # found free here stays free until we hand it out again
+        for buf in self._capture_pool:
+            if not any(buf is frame for frame in busy):
+                return buf
+        return None
+        
+    def _keep_capture_buffer(self, old, new):
+        """Pool a freshly allocated frame, replacing the buffer it was meant to reuse"""
+        if old is not None:
+            # Wrong size for the current camera - retire it
+            self._capture_pool = [buf for buf in self._capture_pool if buf is not old]
+        if len(self._capture_pool) < self.CAPTURE_POOL_SIZE:
+            self._capture_pool.append(new)
+                    
+    def _frame_wanted(self):
+        """A frame is worth decoding if the detection ring has room or the preview took the last one"""
+        return self._latest_taken or len(self._frame_ring) < self._frame_ring.maxlen
+        
+    def get_latest_frame(self):
+        """Return the newest captured frame (for display) without consuming it
+        
+        The frame stays valid until the next call.
+        """
+        with self._frame_ready:
+            self._latest_taken = True
+            self._preview_frame = self._latest_frame
+            return self._latest_frame
+        
+    def next_frame(self, timeout=0.5):
+        """Consumer: wait for the next queued frame, or None on timeout
+        
+        The frame stays valid until the next call.
+        """
+        with self._frame_ready:
+            # The caller is done with the frame from the previous call
+            self._detect_frame = None
+            if not self._frame_ready.wait_for(lambda: self._frame_ring, timeout):
+                return None
+            self._detect_frame = self._frame_ring.popleft()
+            return self._detect_frame
+        
+    def check_motion(self, frame):
+        """Run detect_motion on every Nth frame and reuse the last result in between"""
+        if frame is None:
+            return False
             
-            return movement_percentage > threshold
+        self._motion_frame_counter += 1
+        if self._motion_frame_counter >= self.motion_detect_stride:
+            self._motion_frame_counter = 0
+            self._last_motion_result = self.detect_motion(frame)
+            
+        return self._last_motion_result
+        
+    @property
+    def motion_sensitivity(self):
+        return self._motion_sensitivity
+        
+    @motion_sensitivity.setter
+    def motion_sensitivity(self, value):
+        self._motion_sensitivity = value
+        self._update_motion_thresholds()
+        
+    def _update_motion_thresholds(self):
+        """Turn sensitivity into changed-pixel counts for the current motion frame size"""
+        # Simple method: 1% to 5.8% of pixels changed; MOG2: half that
+        simple_percent = (30 - self._motion_sensitivity) / 5
+        mog2_percent = (30 - self._motion_sensitivity) / 10
+        self._simple_min_pixels = int(self._motion_pixels * simple_percent / 100)
+        self._mog2_min_pixels = int(self._motion_pixels * mog2_percent / 100)
+        
+    def _allocate_motion_buffers(self, small_shape):
+        """Size the motion scratch buffers (and thresholds) for a new frame size"""
+        motion_shape = small_shape[:2]
+        self._motion_pixels = motion_shape[0] * motion_shape[1]
+        self._update_motion_thresholds()
+        
+        self._small_buf = np.empty(small_shape, dtype=np.uint8)
+        self._gray_buf = np.empty(motion_shape, dtype=np.uint8)
+        self._blur_buf = np.empty(motion_shape, dtype=np.uint8)
+        self._prev_gray_buf = np.empty(motion_shape, dtype=np.uint8)
+        self._delta_buf = np.empty(motion_shape, dtype=np.uint8)
+        self._thresh_buf = np.empty(motion_shape, dtype=np.uint8)
+        self._fgmask_buf = np.empty(motion_shape, dtype=np.uint8)
+        
+        # The running average belongs to the old size
+        self.prev_frame = None
+        
+    def _motion_gray(self, frame):
+        """Grayscale copy of the frame at half resolution for motion analysis
         
-        # Option 2: Background subtraction method (more accurate but slower)
+        Returns a scratch buffer that is overwritten on the next call.
+        """
+        # Motion doesn't need full resolution - halving each dimension means
+        # every later step touches a quarter of the pixels
+        small_shape = (frame.shape[0] // 2, frame.shape[1] // 2) + frame.shape[2:]
+        if self._small_buf is None or self._small_buf.shape != small_shape:
+            # First frame, or the camera delivered a new size
+            self._allocate_motion_buffers(small_shape)
+            
+        cv2.resize(frame, (small_shape[1], small_shape[0]), dst=self._small_buf,
+                   interpolation=cv2.INTER_AREA)
+        
+        # Single-channel input is already an intensity plane; otherwise convert
+        # after downsampling so the color conversion only sees a quarter of the pixels
+        if self._small_buf.ndim == 2:
+            return self._small_buf
+        cv2.cvtColor(self._small_buf, cv2.COLOR_BGR2GRAY, dst=self._gray_buf)
+        return self._gray_buf
+        
+    def select_motion_method(self):
+        """Bind detect_motion to the configured detector
+        
+        Called at startup and whenever the method setting changes, so the
+        per-frame path dispatches straight to the right implementation
+        instead of consulting the config every frame.
+        """
+        if self.config.get("use_simple_motion_detection", True):
+            self.detect_motion = self._detect_motion_simple
         else:
-            # Convert to grayscale and apply Gaussian blur
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            gray = cv2.GaussianBlur(gray, (21, 21), 0)
-            
-            # Apply background subtraction
-            fg_mask = self.background_subtractor.apply(gray)
+            self.detect_motion = self._detect_motion_mog2
             
-            # Thresholding
-            thresh = cv2.threshold(fg_mask, 25, 255, cv2.THRESH_BINARY)[1]
-            thresh = cv2.dilate(thresh, None, iterations=2)
-            
-            # Count white pixels
-            white_pixel_count = np.sum(thresh == 255)
-            total_pixels = thresh.shape[0] * thresh.shape[1]
-            movement_percentage = (white_pixel_count / total_pixels) * 100
+        # Reset the previous frame when changing methods
+        self.prev_frame = None
+        
+    def _detect_motion_simple(self, frame):
+        """Simple frame difference method (faster)"""
+        if frame is None:
+            return False
             
-            # Detect motion based on sensitivity
-            if movement_percentage > (30 - self.motion_sensitivity) / 10:
-                return True
+        # Convert to grayscale at reduced resolution, then blur.
+        # Every step writes into a preallocated buffer (dst=...)
+        gray = self._motion_gray(frame)
+        blurred = cv2.GaussianBlur(gray, (11, 11), 0, dst=self._blur_buf)  # Smaller kernel for the smaller image
+
+        # If first frame (or the camera resolution changed), initialize and return
+        if self.prev_frame is None:
+            self.prev_frame = blurred.astype(np.float32)
+            return False
             
+        # Calculate absolute difference between current and previous frame
+        prev_gray = cv2.convertScaleAbs(self.prev_frame, dst=self._prev_gray_buf)
+        frame_delta = cv2.absdiff(prev_gray, blurred, dst=self._delta_buf)
+        thresh = cv2.threshold(frame_delta, 25, 255, cv2.THRESH_BINARY, dst=self._thresh_buf)[1]
+        
+        # Update previous frame for next time (with some averaging for stability).
+        # accumulateWeighted blends in place into the float32 running average,
+        # so no new array is allocated and no precision is lost to uint8 rounding.
+        cv2.accumulateWeighted(blurred, self.prev_frame, 0.3)
+        
+        # Compare changed pixels against the precomputed sensitivity threshold
+        return cv2.countNonZero(thresh) > self._simple_min_pixels
+        
+    def _detect_motion_mog2(self, frame):
+        """Background subtraction method (more accurate but slower)"""
+        if frame is None:
             return False
+            
+        # Convert to grayscale at reduced resolution. No blur here - MOG2
+        # already models per-pixel variance, so pre-smoothing is wasted work
+        gray = self._motion_gray(frame)
+        
+        # Apply background subtraction. Without shadow detection the mask
+        # is already strictly 0/255, so no separate threshold pass is needed.
+        # Both steps write into the preallocated scratch buffers
+        fg_mask = self.background_subtractor.apply(gray, self._fgmask_buf)
+        thresh = cv2.dilate(fg_mask, self.DILATE_KERNEL, dst=self._thresh_buf, iterations=1)
+        
+        # Detect motion based on the precomputed sensitivity threshold
+        return cv2.countNonZero(thresh) > self._mog2_min_pixels
         
     def start_recording(self, filename=None):
         if filename is None:
             timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = os.path.join(self.output_directory, f"motion_{timestamp}.mp4")
             
-        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-        self.video_writer = cv2.VideoWriter(filename, fourcc, 20, 
-                                           (self.frame_width, self.frame_height))
+        with self._record_lock:
+            return self._open_writer(filename)
+            
+    def _open_writer(self, filename):
+        # Prefer the VideoToolbox hardware encoder; fall back to OpenCV's
+        # software mp4v writer if ffmpeg is missing or fails to start
+        self.video_writer = None
+        if FFmpegVideoWriter.available():
+            writer = FFmpegVideoWriter(filename, 20, (self.frame_width, self.frame_height))
+            if writer.isOpened():
+                self.video_writer = writer
+                
+        if self.video_writer is None:
+            self.video_writer = self._software_writer(filename)
         self.is_recording = True
         self.current_recording_file = filename
         return filename
         
+    def _software_writer(self, filename):
+        return cv2.VideoWriter(filename, self.MP4V_FOURCC, 20, (self.frame_width, self.frame_height))
+        
     def stop_recording(self):
-        if self.is_recording:
-            self.video_writer.release()
-            self.is_recording = False
-            return self.current_recording_file
-        return None
+        with self._record_lock:
+            if self.is_recording:
+                self.video_writer.release()
+                self.is_recording = False
+                return self.current_recording_file
+            return None
         
     def record_frame(self, frame):
-        if self.is_recording and frame is not None:
-            self.video_writer.write(frame)
+        with self._record_lock:
+            if self.is_recording and frame is not None:
+                self.video_writer.write(frame)
+                if isinstance(self.video_writer, FFmpegVideoWriter) and not self.video_writer.isOpened():
+                    # ffmpeg exited (e.g. the encoder failed to initialise) -
+                    # carry on in a second file with OpenCV's writer, keeping
+                    # whatever ffmpeg already wrote
+                    self.video_writer.release()
+                    base, ext = os.path.splitext(self.current_recording_file)
+                    self.current_recording_file = f"{base}_sw{ext}"
+                    logger.warning(f"ffmpeg encoder stopped; continuing in {os.path.basename(self.current_recording_file)}")
+                    self.video_writer = self._software_writer(self.current_recording_file)
+                    self.video_writer.write(frame)
 
 # Audio and voice detection
+class AudioRingBuffer:
+    """Fixed-size int16 ring buffer fed by the PortAudio callback thread
+    
+    There is a single writer, so no lock is needed: samples are copied in
+    first and write_pos (a running total of samples written) is advanced
+    afterwards, which is what readers use to find new data.
+    """
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._buffer = np.zeros(capacity, dtype='<i2')
+        self.write_pos = 0
+        
+    def write(self, samples):
+        count = samples.size
+        if count > self.capacity:
+            # Only the newest samples fit
+            samples = samples[-self.capacity:]
+            self.write_pos += count - self.capacity
+            count = self.capacity
+            
+        start = self.write_pos % self.capacity
+        first = min(count, self.capacity - start)
+        self._buffer[start:start + first] = samples[:first]
+        self._buffer[:count - first] = samples[first:]
+        self.write_pos += count
+        
+    def read_since(self, position):
+        """Samples written since position, and the position to read from next time"""
+        end = self.write_pos
+        return self._read(position, end), end
+        
+    def _read(self, start, end):
+        # Anything older than one capacity has already been overwritten
+        start = max(start, end - self.capacity)
+        count = end - start
+        if count <= 0:
+            return self._buffer[:0].copy()
+            
+        offset = start % self.capacity
+        if offset + count <= self.capacity:
+            return self._buffer[offset:offset + count].copy()
+        return np.concatenate((self._buffer[offset:], self._buffer[:offset + count - self.capacity]))
+
 class AudioManager:
+    # Mean absolute amplitude above which a buffer counts as voice
+    VOICE_ENERGY_THRESHOLD = 1500  # Higher threshold for better performance
+    # Zero crossings per sample typical of speech at 16 kHz; hum sits below
+    # this band, broadband bangs and hiss sit above it
+    VOICE_ZCR_RANGE = (0.02, 0.25)
+    # Hysteresis over ~64ms buffers: trigger once VOICE_TRIGGER_BUFFERS of the
+    # last VOICE_HISTORY_BUFFERS were voice (~0.4s within ~0.8s, so the gaps
+    # between syllables don't reset it but one loud sound isn't enough);
+    # release after VOICE_RELEASE_BUFFERS quiet ones in a row (~1.3s)
+    VOICE_HISTORY_BUFFERS = 12
+    VOICE_TRIGGER_BUFFERS = 6
+    VOICE_RELEASE_BUFFERS = 20
+    SAMPLE_RATE = 16000
+    RECORD_BUFFER_SECONDS = 60  # Initial recording buffer; grows if a recording runs longer
+    RING_BUFFER_SECONDS = 10    # Audio kept for readers between polls
+    VOICE_WINDOW_SAMPLES = 4096 # Most new audio analysed per voice check, after a stall
+    VOICE_POLL_INTERVAL = 1024 / 16000  # One PortAudio buffer (~64ms)
+
     def __init__(self, config):
         self.config = config
         self.voice_detection_enabled = config["voice_detection_enabled"]
-        self.audio = pyaudio.PyAudio()
+        self.audio = pyaudio.PyAudio() if pyaudio is not None else None
         self.stream = None
+        self.available_mics = []
         self.is_recording = False
         self.voice_detected = False
+        self._voice_active = False
+        self._voice_history = collections.deque(maxlen=self.VOICE_HISTORY_BUFFERS)
+        self._voice_hits = 0       # Voice buffers in _voice_history
+        self._voice_misses = 0     # Quiet buffers in a row
         self.output_directory = config["output_directory"]
-        self.recognizer = sr.Recognizer()
-        self.frames = []
+        self.recognizer = sr.Recognizer() if sr is not None else None
+        self._record_lock = threading.Lock()  # record_audio runs off the UI thread
+        
+        # Recorded samples go into one preallocated int16 buffer instead of a
+        # list of small byte strings, so stopping doesn't have to join them
+        self._pcm = np.empty(self.SAMPLE_RATE * self.RECORD_BUFFER_SECONDS, dtype='<i2')
+        self._pcm_len = 0
+        
+        # The stream runs in callback mode: PortAudio's own thread pushes every
+        # buffer into this ring, and voice detection/recording just read from it
+        self._ring = AudioRingBuffer(self.SAMPLE_RATE * self.RING_BUFFER_SECONDS)
+        self._record_pos = 0       # Ring position recording has consumed up to
+        self._voice_check_pos = 0  # Ring position at the last voice check
+        
+        # Voice detection runs on its own thread at the stream's buffer
+        # cadence; detect_voice() just reads the flag it maintains
+        self._voice_thread = None
+        self._voice_stop = threading.Event()
         
         # Initialize selected microphone
         self.selected_microphone_index = config.get("selected_microphone_index", None)
         
-    def get_available_microphones(self):
-        """Detect available microphones and return a list of their names and indices"""
+    def get_available_microphones(self, refresh=False):
+        """Detect available microphones and return a list of their names and indices
+        
+        The result is cached; pass refresh=True to enumerate the devices again.
+        """
+        if self.available_mics and not refresh:
+            return self.available_mics
+            
         available_mics = []
         
-        # Loop through all audio devices
-        for i in range(self.audio.get_device_count()):
+        # Loop through all audio devices (none without pyaudio)
+        device_count = self.audio.get_device_count() if self.audio is not None else 0
+        for i in range(device_count):
             try:
                 device_info = self.audio.get_device_info_by_index(i)
                 # Only include input devices (microphones)
@@ -383,6 +941,7 @@ class AudioManager:
         if not available_mics:
             available_mics.append({"index": None, "name": "Default microphone", "channels": 1, "sample_rate": 16000})
             
+        self.available_mics = available_mics
         return available_mics
     
     def set_microphone(self, mic_index):
@@ -400,7 +959,19 @@ class AudioManager:
         # Restart the stream with the new microphone
         return self.start_stream()
         
+    def enable_audio(self):
+        """Open PortAudio once voice support has been installed at runtime"""
+        if self.audio is None and pyaudio is not None:
+            self.audio = pyaudio.PyAudio()
+            self.recognizer = sr.Recognizer()
+            self.available_mics = []
+        return self.audio is not None
+        
     def start_stream(self):
+        if self.audio is None:
+            print("Voice detection unavailable: pyaudio is not installed")
+            return False
+            
         try:
             # Use the selected microphone index if available
             input_device = None
@@ -413,70 +984,162 @@ class AudioManager:
                 rate=16000,
                 input=True,
                 input_device_index=input_device,
-                frames_per_buffer=1024
+                frames_per_buffer=1024,
+                stream_callback=self._pa_callback
             )
+            self._start_voice_thread()
             return True
         except Exception as e:
             print(f"Error starting audio stream: {e}")
             return False
             
+    def _pa_callback(self, in_data, frame_count, time_info, status):
+        """PortAudio callback (audio thread): store the buffer and return immediately"""
+        self._ring.write(np.frombuffer(in_data, dtype='<i2'))
+        return (None, pyaudio.paContinue)
+        
     def stop_stream(self):
         if self.stream is not None:
             self.stream.stop_stream()
             self.stream.close()
+            self.stream = None
             
     def terminate(self):
+        self._voice_stop.set()
+        if self._voice_thread is not None:
+            self._voice_thread.join(timeout=1)
+            self._voice_thread = None
         self.stop_stream()
-        self.audio.terminate()
+        if self.audio is not None:
+            self.audio.terminate()
         
     def detect_voice(self):
-        if not self.voice_detection_enabled or self.stream is None:
-            return False
-            
-        try:
-            # Create a small audio buffer to analyze
-            data = self.stream.read(4096, exception_on_overflow=False)
-            
-            # Use energy threshold to detect if someone might be speaking
-            energy = sum(abs(int.from_bytes(data[i:i+2], byteorder='little', signed=True)) 
-                        for i in range(0, len(data), 2)) / (len(data)/2)
+        """Current voice state as maintained by the voice thread (never blocks)"""
+        return self.voice_detection_enabled and self.stream is not None and self._voice_active
+        
+    def _start_voice_thread(self):
+        if self._voice_thread is not None and self._voice_thread.is_alive():
+            return
             
-            # If energy is high, it might be speech (simplified for performance)
-            if energy > 1500:  # Higher threshold for better performance
-                return True
+        self._voice_stop.clear()
+        self._voice_thread = threading.Thread(target=self._voice_loop, daemon=True)
+        self._voice_thread.start()
+        
+    def _voice_loop(self):
+        """Analyse new audio once per stream buffer until terminate() (voice thread)"""
+        while not self._voice_stop.wait(self.VOICE_POLL_INTERVAL):
+            if not self.voice_detection_enabled or self.stream is None:
+                # Start from silence when detection comes back on
+                self._voice_active = False
+                self._voice_history.clear()
+                self._voice_hits = self._voice_misses = 0
+                continue
                 
+            try:
+                # Nothing new since the last check - keep the current state
+                # rather than counting the same audio twice
+                if self._ring.write_pos == self._voice_check_pos:
+                    continue
+                    
+                # Analyse only the audio captured since the last check
+                start = max(self._voice_check_pos, self._ring.write_pos - self.VOICE_WINDOW_SAMPLES)
+                samples, self._voice_check_pos = self._ring.read_since(start)
+                if samples.size < 2:
+                    continue
+                    
+                self._update_voice_state(self._is_voice_buffer(samples))
+            except Exception as e:
+                print(f"Error in voice detection: {e}")
+            
+    def _is_voice_buffer(self, samples):
+        """Loud enough and with a speech-like zero-crossing rate"""
+        # Mean absolute amplitude; widen to int32 first so abs(-32768) doesn't overflow
+        energy = np.abs(samples.astype(np.int32)).mean()
+        if energy <= self.VOICE_ENERGY_THRESHOLD:
             return False
-        except Exception as e:
-            print(f"Error in voice detection: {e}")
-            return False
             
+        # Zero-crossing rate rejects loud transients (door slams) and hum
+        negative = samples < 0
+        zcr = np.count_nonzero(negative[1:] != negative[:-1]) / samples.size
+        low, high = self.VOICE_ZCR_RANGE
+        return low <= zcr <= high
+        
+    def _update_voice_state(self, is_voice):
+        """Apply hysteresis so a single loud buffer doesn't count as voice"""
+        if len(self._voice_history) == self._voice_history.maxlen:
+            self._voice_hits -= self._voice_history[0]
+        self._voice_history.append(is_voice)
+        self._voice_hits += is_voice
+        self._voice_misses = 0 if is_voice else self._voice_misses + 1
+            
+        if not self._voice_active and self._voice_hits >= self.VOICE_TRIGGER_BUFFERS:
+            self._voice_active = True
+        elif self._voice_active and self._voice_misses >= self.VOICE_RELEASE_BUFFERS:
+            self._voice_active = False
+            
+        return self._voice_active
+        
     def start_recording(self, filename=None):
+        """Start an audio recording; returns its path, or None without pyaudio"""
+        if self.audio is None:
+            return None
+            
         if filename is None:
             timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = os.path.join(self.output_directory, f"audio_{timestamp}.wav")
             
-        self.frames = []
-        self.is_recording = True
-        self.current_recording_file = filename
+        with self._record_lock:
+            self._pcm_len = 0
+            self._record_pos = self._ring.write_pos  # Record from now on
+            self.is_recording = True
+            self.current_recording_file = filename
         return filename
         
     def stop_recording(self):
-        if self.is_recording:
-            wf = wave.open(self.current_recording_file, 'wb')
-            wf.setnchannels(1)
-            wf.setsampwidth(self.audio.get_sample_size(pyaudio.paInt16))
-            wf.setframerate(16000)
-            wf.writeframes(b''.join(self.frames))
-            wf.close()
-            self.is_recording = False
-            self.frames = []
-            return self.current_recording_file
-        return None
+        if self.audio is None:
+            return None
+            
+        with self._record_lock:
+            if self.is_recording:
+                # Pick up whatever arrived since the last record_audio call
+                self._drain_ring()
+                
+                wf = wave.open(self.current_recording_file, 'wb')
+                wf.setnchannels(1)
+                wf.setsampwidth(self._pcm.itemsize)  # int16
+                wf.setframerate(self.SAMPLE_RATE)
+                wf.writeframes(self._pcm[:self._pcm_len])  # Written straight from the buffer, no copy
+                wf.close()
+                self.is_recording = False
+                self._pcm_len = 0
+                
+                # Give back memory if a long recording grew the buffer
+                if self._pcm.size > self.SAMPLE_RATE * self.RECORD_BUFFER_SECONDS:
+                    self._pcm = np.empty(self.SAMPLE_RATE * self.RECORD_BUFFER_SECONDS, dtype='<i2')
+                return self.current_recording_file
+            return None
         
     def record_audio(self):
-        if self.is_recording and self.stream is not None:
-            data = self.stream.read(1024, exception_on_overflow=False)
-            self.frames.append(data)
+        """Move newly captured audio into the recording (non-blocking)"""
+        if self.audio is not None and self.is_recording:
+            with self._record_lock:
+                if self.is_recording:
+                    self._drain_ring()
+                    
+    def _drain_ring(self):
+        samples, self._record_pos = self._ring.read_since(self._record_pos)
+        self._append_pcm(samples)
+        
+    def _append_pcm(self, chunk):
+        """Copy samples into the recording buffer, doubling it when full"""
+        end = self._pcm_len + chunk.size
+        if end > self._pcm.size:
+            grown = np.empty(max(end, self._pcm.size * 2), dtype='<i2')
+            grown[:self._pcm_len] = self._pcm[:self._pcm_len]
+            self._pcm = grown
+            
+        self._pcm[self._pcm_len:end] = chunk
+        self._pcm_len = end
 
 # Headless monitoring class for SSH/command-line control
 class HeadlessMonitor:
@@ -500,8 +1163,12 @@ class HeadlessMonitor:
                 return False
                 
             if not self.audio_manager.start_stream():
-                logger.error("Failed to start audio stream")
-                return False
+                if pyaudio is None:
+                    # Keep going on video alone
+                    logger.warning("Voice detection unavailable: run the installer with --voice to add it")
+                else:
+                    logger.error("Failed to start audio stream")
+                    return False
                 
             return True
             
@@ -572,7 +1239,6 @@ class HeadlessMonitor:
         start_time = time.time()
         last_motion_time = 0
         last_voice_time = 0
-        last_voice_check_time = 0
         
         try:
             while self.monitoring and not self.stop_event.is_set():
@@ -590,14 +1256,10 @@ class HeadlessMonitor:
                     continue
                     
                 # Check for motion
-                motion_detected = self.camera_manager.detect_motion(frame)
+                motion_detected = self.camera_manager.check_motion(frame)
                 
-                # Check for voice (throttled)
-                voice_detected = False
-                current_time = time.time()
-                if current_time - last_voice_check_time > 0.3:
-                    voice_detected = self.audio_manager.detect_voice()
-                    last_voice_check_time = current_time
+                # Check for voice (updated continuously by the audio manager's thread)
+                voice_detected = self.audio_manager.detect_voice()
                 
                 # Handle detection events
                 if motion_detected:
@@ -701,6 +1363,12 @@ class HeadlessMonitor:
 
 # Main application
 class SecurityApp:
+    # Preview refresh period in seconds (10 fps)
+    PREVIEW_INTERVAL = 0.1
+    
+    # How long an indicator stays lit after the last detection
+    INDICATOR_HOLD_MS = 1000
+    
     def __init__(self, root):
         self.root = root
         self.root.title("iMac Security System v1.1.0 (Rev 49)")
@@ -736,6 +1404,7 @@ class SecurityApp:
         else:
             # Standard ttk - just use the default style
             self.style = ttk.Style()
+        init_button_styles()
         
         # Initialize configuration manager
         self.config_manager = ConfigManager()
@@ -764,15 +1433,50 @@ class SecurityApp:
         
         # State variables
         self.monitoring = False
-        self.last_motion_time = 0
-        self.last_voice_time = 0
-        self.last_voice_check_time = 0  # For throttling voice detection
-        self.last_ui_update_time = 0    # For throttling UI updates
+        self._recording_deadline_ns = 0   # Keep recording until this (monotonic) time
+        self._indicator_resets = {}       # Pending after() ids that turn indicators gray
+        
+        # Detection runs on a worker thread; it hands UI work (status text,
+        # recordings refresh) back to the Tk thread through this queue
+        self._ui_events = queue.Queue()
+        self._recording_lock = threading.Lock()
+        self._detection_stop = threading.Event()
+        self._detection_thread = threading.Thread(target=self._detection_loop, daemon=True)
+        
+        # Pending debounced config save (see _schedule_save)
+        self._save_after_id = None
+        
+        # (directory, mtime) the recordings list was last built from
+        self._recordings_key = None
+        
+        # Preview rendering runs on a worker thread: it scales and converts
+        # the newest frame into PPM bytes and publishes them as one
+        # (size, data) tuple; the Tk tick only hands that tuple to the
+        # PhotoImage. Tk isn't thread-safe, so the PhotoImage stays on the
+        # Tk thread
+        self._preview_key = None
+        self._preview_stages = []
+        self._preview_ppm = None
+        self._preview_size = None
+        self._preview_ready = None   # Latest rendered (size, data) from the worker
+        self._preview_shown = None   # The one currently on screen
+        self._preview_photo = None
+        self._preview_photo_size = None
+        self._preview_deadline = 0
+        self._preview_stop = threading.Event()
+        self._preview_thread = threading.Thread(target=self._preview_loop, daemon=True)
+        
+        # Preview container size, kept current by a <Configure> binding so
+        # the preview tick doesn't have to query Tk for it
+        self._container_size = (0, 0)
         
         # Create UI
         self.create_ui()
         
-        # Start preview
+        # Start capture, detection and preview threads, then the preview tick
+        self.camera_manager.start_capture()
+        self._detection_thread.start()
+        self._preview_thread.start()
         self.update_preview()
         
     def create_ui(self):
@@ -843,6 +1547,7 @@ class SecurityApp:
         # Create a container frame with fixed size based on selected preview size
         self.preview_container = ttk.Frame(preview_frame)
         self.preview_container.pack(expand=True, padx=5, pady=5)
+        self.preview_container.bind("<Configure>", self._on_container_resize)
         
         # Preview label inside the container
         self.preview_label = ttk.Label(self.preview_container)
@@ -863,15 +1568,12 @@ class SecurityApp:
             self.style.configure("Info.TButton", foreground="white", background="blue")
             self.style.configure("Secondary.TButton", foreground="white", background="gray")
         
-        # Get the button style parameter name based on whether we're using ttkbootstrap
-        button_style_param = "bootstyle" if USE_TTKBOOTSTRAP else "style"
-        
         # Start/Stop button
         self.start_stop_button = ttk.Button(
             control_frame, 
             text="Start Monitoring", 
             command=self.toggle_monitoring,
-            **{button_style_param: SUCCESS if USE_TTKBOOTSTRAP else "Success.TButton"}
+            **STYLE_SUCCESS
         )
         self.start_stop_button.pack(fill="x", padx=5, pady=5)
         
@@ -961,7 +1663,8 @@ class SecurityApp:
         voice_frame = ttk.Frame(detection_tab)
         voice_frame.pack(fill="x", padx=5, pady=10)
         
-        self.voice_detection_var = tk.BooleanVar(value=self.config["voice_detection_enabled"])
+        # Off for this session (but left alone in the config) until voice support is installed
+        self.voice_detection_var = tk.BooleanVar(value=self.config["voice_detection_enabled"] and pyaudio is not None)
         voice_check = ttk.Checkbutton(
             voice_frame,
             text="Enable Voice Detection",
@@ -1053,7 +1756,7 @@ class SecurityApp:
             dir_select_frame,
             text="Browse",
             command=self.browse_output_dir,
-            **{button_style_param: SECONDARY if USE_TTKBOOTSTRAP else "Secondary.TButton"}
+            **STYLE_SECONDARY
         )
         browse_button.pack(side="right", padx=2)
         
@@ -1091,7 +1794,7 @@ class SecurityApp:
             recordings_buttons_frame,
             text="Open Selected",
             command=self.open_selected_recording,
-            **{button_style_param: INFO if USE_TTKBOOTSTRAP else "Info.TButton"}
+            **STYLE_INFO
         )
         open_button.pack(side="left", padx=2)
         
@@ -1099,7 +1802,7 @@ class SecurityApp:
             recordings_buttons_frame,
             text="Refresh",
             command=self.refresh_recordings_list,
-            **{button_style_param: SECONDARY if USE_TTKBOOTSTRAP else "Secondary.TButton"}
+            **STYLE_SECONDARY
         )
         refresh_button.pack(side="right", padx=2)
         
@@ -1114,6 +1817,7 @@ class SecurityApp:
         # Get available cameras
         available_cameras = self.camera_manager.get_available_cameras()
         camera_names = [cam["name"] for cam in available_cameras]
+        self._camera_name_to_index = {cam["name"]: cam["index"] for cam in available_cameras}
         
         # Camera combobox
         ttk.Label(camera_frame, text="Select Camera:").pack(anchor="w", padx=5, pady=2)
@@ -1137,7 +1841,7 @@ class SecurityApp:
             camera_frame,
             text="Apply Camera",
             command=self.change_camera,
-            **{button_style_param: SECONDARY if USE_TTKBOOTSTRAP else "Secondary.TButton"}
+            **STYLE_SECONDARY
         )
         camera_apply_button.pack(anchor="e", padx=5, pady=5)
         
@@ -1149,6 +1853,7 @@ class SecurityApp:
         self.audio_manager.selected_microphone_index = self.config.get("selected_microphone_index", None)
         available_mics = self.audio_manager.get_available_microphones()
         mic_names = [mic["name"] for mic in available_mics]
+        self._mic_name_to_index = {mic["name"]: mic["index"] for mic in available_mics}
         
         # Microphone combobox
         ttk.Label(mic_frame, text="Select Microphone:").pack(anchor="w", padx=5, pady=2)
@@ -1172,12 +1877,22 @@ class SecurityApp:
             mic_frame,
             text="Apply Microphone",
             command=self.change_microphone,
-            **{button_style_param: SECONDARY if USE_TTKBOOTSTRAP else "Secondary.TButton"}
+            **STYLE_SECONDARY
         )
         mic_apply_button.pack(anchor="e", padx=5, pady=5)
         
+        # Device lists are cached after the first scan; rescan on request
+        refresh_devices_button = ttk.Button(
+            devices_tab,
+            text="Refresh Devices",
+            command=self.refresh_devices,
+            **STYLE_SECONDARY
+        )
+        refresh_devices_button.pack(anchor="e", padx=5, pady=5)
+        
         # Status bar
         self.status_var = tk.StringVar(value="Ready")
+        self._status_text = "Ready"  # Mirrors status_var so repeats can skip Tcl
         status_bar = ttk.Label(
             self.root, 
             textvariable=self.status_var, 
@@ -1192,58 +1907,61 @@ class SecurityApp:
         # Set up closing event
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
         
-    def update_preview(self):
-        """Update the video preview - optimized for performance"""
-        if self.camera_manager.camera is None:
-            self.root.after(100, self.update_preview)
-            return
-            
-        ret, frame = self.camera_manager.camera.read()
-        if not ret or frame is None:
-            # If we couldn't get a frame, try again later
-            self.root.after(100, self.update_preview)
-            return
-        
-        # Process motion and voice detection only during monitoring
-        if self.monitoring:
-            # Check for motion - use the optimized detector
-            motion_detected = self.camera_manager.detect_motion(frame)
-            
-            # Don't check for voice every frame to reduce CPU usage
-            # Only check every ~300ms
-            voice_detected = False
-            current_time = time.time()
-            if current_time - self.last_voice_check_time > 0.3:
-                voice_detected = self.audio_manager.detect_voice()
-                self.last_voice_check_time = current_time
-            
-            # Update indicators
-            if motion_detected:
-                self.motion_indicator.config(foreground="green")
-                self.last_motion_time = time.time()
-                self.camera_manager.motion_detected = True
-            elif time.time() - self.last_motion_time > 1:
-                self.motion_indicator.config(foreground="gray")
+    def _detection_loop(self):
+        """Consume camera frames for motion/voice detection and recording (worker thread)"""
+        while not self._detection_stop.is_set():
+            # Leave the queue alone while idle so the capture thread can skip
+            # decoding frames that only the preview would otherwise need
+            if not self.monitoring:
+                self._detection_stop.wait(0.1)
+                continue
+                
+            frame = self.camera_manager.next_frame(timeout=0.5)
+            if frame is None:
+                continue
+                
+            try:
+                self._process_frame(frame)
+            except Exception as e:
+                print(f"Error in detection loop: {e}")
                 
-            if voice_detected:
-                self.voice_indicator.config(foreground="green")
-                self.last_voice_time = time.time()
-                self.audio_manager.voice_detected = True
-            elif time.time() - self.last_voice_time > 1:
-                self.voice_indicator.config(foreground="gray")
+    def _process_frame(self, frame):
+        # Check for motion - use the optimized detector
+        motion_detected = self.camera_manager.check_motion(frame)
+        
+        # Voice detection runs on the audio manager's own thread; this is a flag read
+        voice_detected = self.audio_manager.detect_voice()
+        now = time.monotonic_ns()
+        
+        # Light the indicators (on the Tk thread) and push the recording deadline out
+        if motion_detected:
+            self.camera_manager.motion_detected = True
+            self._ui_events.put(("detected", "motion"))
+            
+        if voice_detected:
+            self.audio_manager.voice_detected = True
+            self._ui_events.put(("detected", "voice"))
+            
+        if motion_detected or voice_detected:
+            self._recording_deadline_ns = now + int(self.config["post_detection_record_time"] * 1_000_000_000)
+            
+        with self._recording_lock:
+            # Monitoring may have been switched off while we were detecting
+            if not self.monitoring:
+                return
                 
             # Handle recording
             if (motion_detected or voice_detected) and not self.camera_manager.is_recording:
                 timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
                 video_file = self.camera_manager.start_recording()
                 audio_file = self.audio_manager.start_recording()
-                self.status_var.set(f"Recording started at {timestamp}")
+                self._ui_events.put(("status", f"Recording started at {timestamp}"))
                 
             # Update recording state
             if self.camera_manager.is_recording:
                 # Check if we should continue recording
                 if (self.camera_manager.motion_detected or self.audio_manager.voice_detected or 
-                        time.time() - max(self.last_motion_time, self.last_voice_time) < self.config["post_detection_record_time"]):
+                        now < self._recording_deadline_ns):
                     # Keep recording
                     self.camera_manager.record_frame(frame)
                     self.audio_manager.record_audio()
@@ -1255,72 +1973,199 @@ class SecurityApp:
                     # Stop recording after timeout
                     video_file = self.camera_manager.stop_recording()
                     audio_file = self.audio_manager.stop_recording()
-                    self.status_var.set(f"Recording stopped: {os.path.basename(video_file)}")
-                    self.refresh_recordings_list()
-        
-        # Process frame for display - resize to match container size
-        try:
-            # Get the current container dimensions
-            container_width = self.preview_container.winfo_width()
-            container_height = self.preview_container.winfo_height()
-            
-            # Only resize if we have valid dimensions
-            if container_width > 10 and container_height > 10:
-                # Calculate scaling ratio
-                ratio = min(container_width / frame.shape[1], container_height / frame.shape[0])
+                    self._ui_events.put(("status", f"Recording stopped: {os.path.basename(video_file)}"))
+                    self._ui_events.put(("refresh", None))
+                    
+    def _process_ui_events(self):
+        """Apply UI updates queued by the detection thread (Tk thread only)"""
+        while True:
+            try:
+                event, value = self._ui_events.get_nowait()
+            except queue.Empty:
+                break
                 
-                # Resize the frame to fit the container
-                new_width = max(int(frame.shape[1] * ratio), 1)
-                new_height = max(int(frame.shape[0] * ratio), 1)
+            if event == "status":
+                self._set_status(value)
+            elif event == "refresh":
+                self.refresh_recordings_list()
+            elif event == "detected":
+                self._flash_indicator(value)
+            elif event == "voice_support":
+                self._voice_support_ready(value)
                 
-                # Use INTER_NEAREST for faster resizing (less quality but better performance)
-                display_frame = cv2.resize(frame, (new_width, new_height), interpolation=cv2.INTER_NEAREST)
-            else:
-                # Invalid dimensions, use original frame
-                display_frame = frame
+    def _set_status(self, text):
+        """Update the status bar, skipping the Tcl call if the text is unchanged"""
+        if text != self._status_text:
+            self._status_text = text
+            self.status_var.set(text)
+            
+    def _flash_indicator(self, name):
+        """Turn an indicator green, and gray again once detections stop for a second"""
+        reset_id = self._indicator_resets.pop(name, None)
+        if reset_id is None:
+            self._indicator(name).config(foreground="green")
+        else:
+            # Already lit - just push the reset back
+            self.root.after_cancel(reset_id)
+        self._indicator_resets[name] = self.root.after(self.INDICATOR_HOLD_MS, self._clear_indicator, name)
+        
+    def _clear_indicator(self, name):
+        self._indicator_resets.pop(name, None)
+        self._indicator(name).config(foreground="gray")
+        
+    def _indicator(self, name):
+        return self.motion_indicator if name == "motion" else self.voice_indicator
                 
-            # Convert to RGB for display
-            display_frame = cv2.cvtColor(display_frame, cv2.COLOR_BGR2RGB)
-            
-            # Convert to PhotoImage
-            img = Image.fromarray(display_frame)
-            imgtk = ImageTk.PhotoImage(image=img)
+    def update_preview(self):
+        """Show the newest rendered preview frame (Tk thread)"""
+        self._process_ui_events()
+        
+        # Nothing newly rendered since the last tick - keep the current image
+        ready = self._preview_ready
+        if ready is not None and ready is not self._preview_shown:
+            self._preview_shown = ready
+            size, data = ready
+            try:
+                # Only swap the PhotoImage when the display size actually changed
+                if size != self._preview_photo_size:
+                    self._preview_photo = tk.PhotoImage(width=size[0], height=size[1])
+                    self._preview_photo_size = size
+                    self.preview_label.config(image=self._preview_photo)
+                    
+                # Tk decodes binary PPM natively, so raw RGB bytes behind a
+                # PPM header skip the PIL round-trip entirely
+                self._preview_photo.configure(data=data, format="PPM")
+            except Exception as e:
+                print(f"Error updating preview: {e}")
+        
+        self._schedule_preview()
+        
+    def _preview_loop(self):
+        """Render the newest camera frame for display (preview thread)"""
+        last_seq = 0
+        while not self._preview_stop.wait(self.PREVIEW_INTERVAL):
+            # Nothing new since the last render
+            seq = self.camera_manager.latest_frame_seq
+            if seq == last_seq:
+                continue
+            last_seq = seq
             
-            # Update display
-            self.preview_label.imgtk = imgtk
-            self.preview_label.config(image=imgtk)
+            # Frames come from the capture thread; we only display the newest one
+            frame = self.camera_manager.get_latest_frame()
+            if frame is None:
+                continue
             
-        except Exception as e:
-            print(f"Error updating preview: {e}")
+            try:
+                # The pipeline only depends on the frame size and the container
+                # size; rebuild it when either changes, otherwise just run it
+                key = (frame.shape, self._container_size)
+                if key != self._preview_key:
+                    self._build_preview_pipeline(frame.shape)
+                    self._preview_key = key
+                    
+                image = frame
+                for stage in self._preview_stages:
+                    image = stage(image)
+                    
+                # Publish with a single assignment. Tkinter only accepts bytes,
+                # hence the copy - which also frees the PPM buffer for the next render
+                self._preview_ready = (self._preview_size, bytes(self._preview_ppm))
+            except Exception as e:
+                print(f"Error rendering preview: {e}")
+                
+    def _on_container_resize(self, event):
+        self._container_size = (event.width, event.height)
         
-        # Schedule next update - use 100ms (10 fps) for better performance
-        self.root.after(100, self.update_preview)
+    def _build_preview_pipeline(self, frame_shape):
+        """Plan the preview conversion for one frame size / container size pair
+        
+        Works out the display size, allocates every buffer, and stores the
+        steps as partials with all arguments bound, so each render just feeds
+        the frame through self._preview_stages. Runs on the preview thread.
+        """
+        # Container dimensions as of the last <Configure> event
+        container_width, container_height = self._container_size
+        src_height, src_width = frame_shape[:2]
+        
+        # Only resize if we have valid dimensions
+        if container_width > 10 and container_height > 10:
+            # Calculate scaling ratio
+            ratio = min(container_width / src_width, container_height / src_height)
+            
+            # Resize the frame to fit the container
+            width = max(int(src_width * ratio), 1)
+            height = max(int(src_height * ratio), 1)
+        else:
+            # Invalid dimensions, use original frame
+            height, width = src_height, src_width
+            
+        stages = []
+        
+        # Halve with pyrDown while the frame is still at least twice the
+        # target size - a fused blur-and-decimate that's cheaper than a general
+        # resize over a large ratio. Each level gets its own buffer
+        while src_width >= width * 2 and src_height >= height * 2:
+            src_height, src_width = (src_height + 1) // 2, (src_width + 1) // 2
+            pyramid_buf = np.empty((src_height, src_width) + frame_shape[2:], dtype=np.uint8)
+            stages.append(functools.partial(cv2.pyrDown, dst=pyramid_buf))
+            
+        if (src_height, src_width) != (height, width):
+            # INTER_AREA's box filter is the right tool for big reductions;
+            # for what's left after the pyramid (or for upscaling),
+            # INTER_LINEAR is cheaper and still looks far better than NEAREST
+            if width < src_width * 0.5:
+                interpolation = cv2.INTER_AREA
+            else:
+                interpolation = cv2.INTER_LINEAR
+            resized_buf = np.empty((height, width) + frame_shape[2:], dtype=np.uint8)
+            stages.append(functools.partial(cv2.resize, dsize=(width, height), dst=resized_buf,
+                                            interpolation=interpolation))
+            
+        # One PPM image in a single buffer: the header followed by the pixels.
+        # The RGB array is a view onto the pixel part, so the colour conversion
+        # writes straight into the PPM payload
+        header = f"P6 {width} {height} 255\n".encode()
+        self._preview_ppm = bytearray(len(header) + height * width * 3)
+        self._preview_ppm[:len(header)] = header
+        preview_rgb = np.frombuffer(self._preview_ppm, dtype=np.uint8,
+                                    offset=len(header)).reshape(height, width, 3)
+        stages.append(functools.partial(cv2.cvtColor, code=cv2.COLOR_BGR2RGB, dst=preview_rgb))
+        self._preview_stages = stages
+        self._preview_size = (width, height)
+        
+    def _schedule_preview(self):
+        """Schedule the next preview tick on a fixed 10 fps cadence
+        
+        The delay is measured from the previous deadline rather than from the
+        end of this tick, so time spent drawing doesn't stretch the period. If
+        we've fallen more than a tick behind, start over from now instead of
+        firing a burst of catch-up ticks.
+        """
+        now = time.monotonic()
+        self._preview_deadline += self.PREVIEW_INTERVAL
+        if self._preview_deadline < now:
+            self._preview_deadline = now + self.PREVIEW_INTERVAL
+        delay_ms = max(1, int((self._preview_deadline - now) * 1000))
+        self.root.after(delay_ms, self.update_preview)
         
     def toggle_monitoring(self):
         self.monitoring = not self.monitoring
         
         if self.monitoring:
-            # Check if we're using ttkbootstrap for styling
-            if USE_TTKBOOTSTRAP:
-                self.start_stop_button.config(text="Stop Monitoring", bootstyle=DANGER)
-            else:
-                self.start_stop_button.config(text="Stop Monitoring", style="Danger.TButton")
-            self.status_var.set("Monitoring active - waiting for motion or voice")
+            self.start_stop_button.config(text="Stop Monitoring", **STYLE_DANGER)
+            self._set_status("Monitoring active - waiting for motion or voice")
             
             # Write status file for command-line tools
             self._write_status_file(True)
         else:
-            # Check if we're using ttkbootstrap for styling
-            if USE_TTKBOOTSTRAP:
-                self.start_stop_button.config(text="Start Monitoring", bootstyle=SUCCESS)
-            else:
-                self.start_stop_button.config(text="Start Monitoring", style="Success.TButton")
-            self.status_var.set("Monitoring stopped")
+            self.start_stop_button.config(text="Start Monitoring", **STYLE_SUCCESS)
+            self._set_status("Monitoring stopped")
             
             # Stop any active recording
-            if self.camera_manager.is_recording:
-                self.camera_manager.stop_recording()
+            with self._recording_lock:
+                stopped = self.camera_manager.stop_recording()
                 self.audio_manager.stop_recording()
+            if stopped:
                 self.refresh_recordings_list()
                 
             # Update status file
@@ -1346,7 +2191,7 @@ class SecurityApp:
         """Update the size of the preview container based on user selection"""
         size = self.preview_size_var.get()
         self.config["preview_size"] = size
-        self.config_manager.save_config()
+        self._schedule_save()
         
         # Set container dimensions based on size
         if size == "small":
@@ -1366,10 +2211,21 @@ class SecurityApp:
         sensitivity = int(float(value))
         self.camera_manager.motion_sensitivity = sensitivity
         self.config["motion_sensitivity"] = sensitivity
-        self.config_manager.save_config()
+        self._schedule_save()  # Scale fires continuously while dragging
         # Update the displayed value
         self.motion_value_label.config(text=f"{sensitivity}")
         
+    def _schedule_save(self):
+        """Save the config 500ms after the last change instead of on every change"""
+        self.config_manager.mark_dirty()
+        if self._save_after_id is not None:
+            self.root.after_cancel(self._save_after_id)
+        self._save_after_id = self.root.after(500, self._do_save)
+        
+    def _do_save(self):
+        self._save_after_id = None
+        self.config_manager.save_if_dirty()
+        
     def update_video_quality(self):
         """Update video quality/resolution"""
         resolution = self.video_quality_var.get()
@@ -1389,28 +2245,52 @@ class SecurityApp:
         # Reset camera to apply new resolution
         current_camera = self.camera_manager.selected_camera_index
         self.camera_manager.set_camera(current_camera)
-        self.config_manager.save_config()
+        self._schedule_save()
         
     def update_motion_method(self):
         """Update motion detection method"""
         use_simple = self.motion_method_var.get()
         self.config["use_simple_motion_detection"] = use_simple
-        self.config_manager.save_config()
+        self._schedule_save()
         
-        # Reset the previous frame when changing methods
-        self.camera_manager.prev_frame = None
+        # Rebind the detector (this also resets the previous frame)
+        self.camera_manager.select_motion_method()
         
     def toggle_voice_detection(self):
         enabled = self.voice_detection_var.get()
+        if enabled and pyaudio is None:
+            # First use - fetch the voice dependencies before turning it on
+            self.voice_detection_var.set(False)
+            if messagebox.askyesno("Voice Detection",
+                                   "Voice detection needs PyAudio and SpeechRecognition, which aren't installed yet.\n\nInstall them now?"):
+                self._set_status("Installing voice detection support...")
+                threading.Thread(target=self._install_voice_support, daemon=True).start()
+            return
+            
         self.audio_manager.voice_detection_enabled = enabled
         self.config["voice_detection_enabled"] = enabled
-        self.config_manager.save_config()
+        self._schedule_save()
+        
+    def _install_voice_support(self):
+        """Run the voice installer off the Tk thread and report back through the UI queue"""
+        self._ui_events.put(("voice_support", install_voice_support()))
+        
+    def _voice_support_ready(self, installed):
+        if not installed or not self.audio_manager.enable_audio():
+            self._set_status("Voice detection support could not be installed")
+            return
+            
+        self.audio_manager.start_stream()
+        self.refresh_devices()
+        self.voice_detection_var.set(True)
+        self.toggle_voice_detection()
+        self._set_status("Voice detection enabled")
         
     def update_post_detection_time(self, value):
         seconds = int(float(value))
         self.camera_manager.post_detection_record_time = seconds
         self.config["post_detection_record_time"] = seconds
-        self.config_manager.save_config()
+        self._schedule_save()  # Scale fires continuously while dragging
         # Update the displayed value
         self.post_value_label.config(text=f"{seconds}")
         
@@ -1425,28 +2305,44 @@ class SecurityApp:
             self.config["output_directory"] = directory
             self.camera_manager.output_directory = directory
             self.audio_manager.output_directory = directory
-            self.config_manager.save_config()
+            self._schedule_save()
             
             # Make sure the directory exists
             if not os.path.exists(directory):
                 os.makedirs(directory)
                 
     def refresh_recordings_list(self):
-        # Clear current list
-        self.recordings_listbox.delete(0, tk.END)
-        
         # Get recordings from the output directory
         output_dir = self.config["output_directory"]
-        if not os.path.exists(output_dir):
+        try:
+            mtime = os.stat(output_dir).st_mtime_ns
+        except OSError:
+            self._recordings_key = None
+            self.recordings_listbox.delete(0, tk.END)
             return
             
-        files = os.listdir(output_dir)
-        recordings = [f for f in files if f.endswith('.mp4') or f.endswith('.wav')]
-        recordings.sort(reverse=True)  # Most recent first
-        
-        # Add to listbox
-        for recording in recordings[:20]:  # Limit to 20 most recent
-            self.recordings_listbox.insert(tk.END, recording)
+        # Adding or removing a file bumps the directory mtime; if it hasn't
+        # moved, the list on screen is still current
+        key = (output_dir, mtime)
+        if key == self._recordings_key:
+            return
+        self._recordings_key = key
+        
+        # One pass over the directory; DirEntry carries the file type, so no
+        # extra stat per file
+        with os.scandir(output_dir) as entries:
+            recordings = [entry.name for entry in entries
+                          if entry.name.endswith(('.mp4', '.wav')) and entry.is_file()]
+                          
+        # Names carry a %Y%m%d_%H%M%S timestamp, so the largest names are the
+        # most recent; a heap picks the top 20 without sorting everything
+        recordings = heapq.nlargest(20, recordings)
+        
+        # Replace the contents - a single insert call for all items rather
+        # than one Tcl round-trip per row
+        self.recordings_listbox.delete(0, tk.END)
+        if recordings:
+            self.recordings_listbox.insert(tk.END, *recordings)
             
     def open_selected_recording(self):
         selected = self.recordings_listbox.curselection()
@@ -1466,37 +2362,57 @@ class SecurityApp:
     def change_camera(self):
         """Change to the selected camera"""
         selected_camera_name = self.camera_var.get()
-        available_cameras = self.camera_manager.get_available_cameras()
-        
-        # Find the selected camera's index
-        for camera in available_cameras:
-            if camera["name"] == selected_camera_name:
-                # Switch to the selected camera
-                if self.camera_manager.set_camera(camera["index"]):
-                    self.status_var.set(f"Switched to {selected_camera_name}")
-                else:
-                    self.status_var.set(f"Failed to switch to {selected_camera_name}")
-                break
+        if selected_camera_name not in self._camera_name_to_index:
+            return
+            
+        # Switch to the selected camera
+        if self.camera_manager.set_camera(self._camera_name_to_index[selected_camera_name]):
+            self._set_status(f"Switched to {selected_camera_name}")
+        else:
+            self._set_status(f"Failed to switch to {selected_camera_name}")
     
     def change_microphone(self):
         """Change to the selected microphone"""
         selected_mic_name = self.mic_var.get()
-        available_mics = self.audio_manager.get_available_microphones()
         
-        # Find the selected microphone's index
-        for mic in available_mics:
-            if mic["name"] == selected_mic_name:
-                # Switch to the selected microphone
-                if self.audio_manager.set_microphone(mic["index"]):
-                    self.status_var.set(f"Switched to {selected_mic_name}")
-                else:
-                    self.status_var.set(f"Failed to switch to {selected_mic_name}")
-                break
+        # The index may legitimately be None (system default microphone)
+        if selected_mic_name not in self._mic_name_to_index:
+            return
+            
+        # Switch to the selected microphone
+        if self.audio_manager.set_microphone(self._mic_name_to_index[selected_mic_name]):
+            self._set_status(f"Switched to {selected_mic_name}")
+        else:
+            self._set_status(f"Failed to switch to {selected_mic_name}")
+            
+    def refresh_devices(self):
+        """Rescan cameras and microphones and update the device selectors"""
+        available_cameras = self.camera_manager.get_available_cameras(refresh=True)
+        camera_names = [cam["name"] for cam in available_cameras]
+        self._camera_name_to_index = {cam["name"]: cam["index"] for cam in available_cameras}
+        self.camera_combobox.config(values=camera_names)
+        if self.camera_var.get() not in camera_names and camera_names:
+            self.camera_var.set(camera_names[0])
+            
+        available_mics = self.audio_manager.get_available_microphones(refresh=True)
+        mic_names = [mic["name"] for mic in available_mics]
+        self._mic_name_to_index = {mic["name"]: mic["index"] for mic in available_mics}
+        self.mic_combobox.config(values=mic_names)
+        if self.mic_var.get() not in mic_names and mic_names:
+            self.mic_var.set(mic_names[0])
+            
+        self._set_status("Device list refreshed")
                 
     def on_closing(self):
         # Stop monitoring
         self.monitoring = False
         
+        # Stop the workers before tearing down the devices they use
+        self._detection_stop.set()
+        self._preview_stop.set()
+        self._detection_thread.join(timeout=2)
+        self._preview_thread.join(timeout=2)
+        
         # Stop any active recording
         if self.camera_manager.is_recording:
             self.camera_manager.stop_recording()
@@ -1506,7 +2422,10 @@ class SecurityApp:
         self.camera_manager.release_camera()
         self.audio_manager.terminate()
         
-        # Save settings
+        # Save settings (replacing any pending debounced save)
+        if self._save_after_id is not None:
+            self.root.after_cancel(self._save_after_id)
+            self._save_after_id = None
         self.config_manager.save_config()
         
         # Update status file
@@ -1611,5 +2530,5 @@ if __name__ == "__main__":
             print("Or run without ttkbootstrap by modifying the code to use standard ttk")
         elif "import" in str(e).lower():
             print("\nMissing dependency. Try manually installing:")
-            print("  pip install opencv-python numpy pyaudio SpeechRecognition Pillow ttkbootstrap")
+            print("  pip install opencv-python numpy pyaudio SpeechRecognition ttkbootstrap")
         sys.exit(1)